@@ -4,5 +4,5 @@ __version__='0.1.0'
 # Main classes of InSPy-HEP
 from inspyhep.metadata import author, literature, institution
 from inspyhep.literature_tools import InspireRecord
-from inspyhep.author_tools import Author
+from inspyhep.author_tools import Author, build_authors
 from inspyhep.institution_tools import Institution
@@ -1,23 +1,96 @@
-import warnings
 import datetime
 import os
 import re
-from bs4 import BeautifulSoup
+import csv
+import io
+import html
+import importlib.util
+from functools import cached_property
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 
 from inspyhep import metadata
-from inspyhep.literature_tools import InspireRecord, make_request, json_load_hits
-
-
-def strip_string(string):
-    soup = BeautifulSoup(string)
-    text_parts = soup.findAll(text=True)
-    text = "".join(text_parts)
-
-    return text.replace("^", "").replace("\\prime", "'").replace("{", "").replace("}", "").replace("'", "")
+from inspyhep.literature_tools import InspireRecord, RecordArrays, _strip_dollars, get_records_dict, get_hits, get_paged_hits, get_number_of_hits, LITERATURE_FIELDS
+
+# citation suffixes of the entries in publication lists
+_CITATION_FMT = ", citations: %d"
+_CITATION_FMT_WELL_CITED = ", citations: \\textbf{%d}"
+# start of the entries of latex itemized publication lists
+_ITEM = "\\item "
+# runs of two or more spaces
+_DOUBLE_SPACE = re.compile(r" {2,}")
+# html tags (e.g., in titles)
+_HTML_TAG = re.compile("[<].*?[>]")
+# characters not allowed in the url slugs of markdown files (and anything between brackets)
+_SLUG_RE = re.compile("\\[.*\\]|[^a-zA-Z0-9_-]")
+# characters removed by strip_string
+_STRIP_TABLE = str.maketrans("", "", "{}'")
+# markup tags (start, end, comments and declarations) as recognized by an html parser, for strip_string
+_MARKUP_TAG = re.compile(r"<(?:[a-zA-Z/!?][^>]*)>")
+# parser used by strip_string(..., use_bs4=True), chosen once (lxml is faster, if installed)
+_BS_PARSER = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+# header and columns of the coauthor csv for each format
+_COAUTHOR_FORMATS = {
+    "nsf": (
+        ("Author", "Affiliation", "Last Active"),
+        lambda author: (author.full_name, author.affiliation, author.last_update.year),
+    ),
+    "doe": (
+        ("Last Name", "First Name", "Affiliation", "Last Active"),
+        lambda author: (author.last_name, author.first_name, author.affiliation, author.last_update.year),
+    ),
+}
+
+
+def _coauthor_format(format: str) -> tuple:
+    try:
+        return _COAUTHOR_FORMATS[format.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown coauthor format '{format}'. Available formats: {', '.join(_COAUTHOR_FORMATS)}.")
+
+# kinds of author identifiers: ORCID number (e.g., '0000-0002-9584-8877'), Inspire record ID (e.g., 1621061), or Inspire BAI
+_ORCID_RE = re.compile(r"^\d{4}-\d{4}-\d{4}-\d{3}[\dX]$")
+_NUM_RE = re.compile(r"^\d+$")
+# url of the metadata query and location of the metadata in its hits, for each kind of identifier
+_METADATA_QUERIES = {
+    "orcid": ("https://inspirehep.net/api/orcid/{}", lambda hits: hits["metadata"]),
+    "recid": ("https://inspirehep.net/api/authors/{}", lambda hits: hits["metadata"]),
+    "bai": ("https://inspirehep.net/api/authors?q=ids.value:{}", lambda hits: hits[0]["metadata"]),
+}
+
+
+def identifier_kind(identifier) -> str:
+    """identifier_kind classify an author identifier as 'orcid', 'recid', or 'bai'"""
+    identifier = str(identifier)
+    if _ORCID_RE.match(identifier):
+        return "orcid"
+    elif _NUM_RE.match(identifier):
+        return "recid"
+    else:
+        return "bai"
+
+
+def strip_string(string, use_bs4=False):
+    if use_bs4:
+        # full html parsing, for unusual markup
+        # (bs4 is not a requirement of inspyhep, install it with the optional `html` extra: python3 -m pip install -e ".[html]")
+        from bs4 import BeautifulSoup
+
+        # the parser is given explicitly, so bs4 does not look for one (and warn about it) on every call
+        soup = BeautifulSoup(string, _BS_PARSER)
+        text = "".join(soup.find_all(string=True))
+    else:
+        # titles only have simple markup (e.g., <sub>, <i>), so tags are removed with a regex and entities are unescaped
+        text = html.unescape(_MARKUP_TAG.sub("", string))
+
+    # (primes become apostrophes, which are removed)
+    return text.replace("^", "").replace("\\prime", "").translate(_STRIP_TABLE)
 
 
 class Author:
-    def __init__(self, identifier, max_papers=1000):
+    def __init__(self, identifier, max_papers=1000, refresh=False):
         """Author()
 
         Parameters
@@ -26,6 +99,8 @@ class Author:
             the author's BAI string (e.g. 'Steven.Weinberg.1') or ORCID number (e.g., '0000-0002-9584-8877') or Inspires record ID (e.g., 00058003)
         max_papers : int, optional
             Number of papers requested from INSPIRE-HEP, by default 1000
+        refresh : bool, optional
+            if True, ignore cached responses and request all the data from INSPIRE-HEP again, by default False
 
 
         Modified from
@@ -36,55 +111,145 @@ class Author:
 
         self.identifier = identifier
         self.max_papers = max_papers
+        self.refresh = refresh
         self.max_title_length = 100
         self.snapshot_date = datetime.datetime.now()
+        self._publication_list_cache = {}
 
-        # ORCID number (e.g., '0000-0002-9584-8877')
-        if self.identifier.count("-") == 3 and len(self.identifier) == 19:
-            self.orcid = self.identifier
-            self.author_metadata_query = f"https://inspirehep.net/api/orcid/{self.orcid}"
-            self.json_metadata = json_load_hits(make_request(self.author_metadata_query))["metadata"]
+        # sets self.orcid, self.recid, or self.bai
+        kind = identifier_kind(self.identifier)
+        setattr(self, kind, self.identifier)
+        query_template, get_metadata = _METADATA_QUERIES[kind]
+        self.author_metadata_query = query_template.format(self.identifier)
+        # (latex math delimiters are dropped from the author's text, as in the records, see _strip_dollars)
+        self.json_metadata = _strip_dollars(dict(get_metadata(get_hits(self.author_metadata_query, refresh=refresh))))
 
-        # Inspire record ID (e.g., 1621061)
-        elif self.identifier.isnumeric() or type(self.identifier) == int:
-            self.recid = self.identifier
-            self.author_metadata_query = f"https://inspirehep.net/api/authors/{self.recid}"
-            self.json_metadata = json_load_hits(make_request(self.author_metadata_query))["metadata"]
+        ## We start by loading the overview of the author
+        # (from the profile, so that the literature records are not requested yet)
+        self.bai = self.profile_metadata.bai
+
+        ## The author's literature records are only requested from Inspire when first needed (see properties below)
+        # (only the fields used by InspireRecord are requested, in pages of results of at most MAX_PAGE_SIZE records)
+        self.literature_query = f"https://inspirehep.net/api/literature?sort=mostrecent&q=a%20{self.bai}"
+        self.author_record_query = f"https://inspirehep.net/api/literature?sort=mostrecent&fields={LITERATURE_FIELDS}&q=a%20{self.bai}"
+
+    @cached_property
+    def full_json_records(self) -> list:
+        """hits of the Inspire query for all the author's literature records"""
+        return get_paged_hits(self.author_record_query, self.max_papers, refresh=self.refresh)
+
+    @cached_property
+    def inspire_records(self) -> dict:
+        """dictionary of InspireRecord instances for the author's papers, with the inspire texkeys as keys"""
+        return self.get_records_dict(self.full_json_records)
+
+    @cached_property
+    def record_arrays(self) -> RecordArrays:
+        """arrays of record properties for vectorized filtering and counting"""
+        return RecordArrays(self.inspire_records)
+
+    @cached_property
+    def num_hits(self) -> int:
+        """total number of literature records of the author in Inspire
+
+        Only a single hit with a single field is requested, so this does not download the author's records.
+        This is Inspire's total, so it is larger than len(self.inspire_records) when max_papers truncates the records
+        (or when some records cannot be parsed).
+        """
+        return get_number_of_hits(self.literature_query, refresh=self.refresh)
 
-        # Inspire BAI
-        else:
-            self.bai = self.identifier  # same thing
-            self.author_metadata_query = f"https://inspirehep.net/api/authors?q=ids.value:{self.bai}"
-            self.json_metadata = json_load_hits(make_request(self.author_metadata_query))[0]["metadata"]
+    @cached_property
+    def profile_metadata(self) -> metadata.author:
+        """metadata of the author from their Inspire profile only (the author's literature records are not requested)"""
+        return metadata.author.from_json(self.json_metadata)
 
-        ## We start by loading the overview of the author
-        self.metadata = metadata.author(**self.json_metadata)
-        self.bai = self.metadata.bai
-
-        ## Then we load all the author's literature records
-        self.author_record_query = f"https://inspirehep.net/api/literature?sort=mostrecent&size={self.max_papers}&q=a%20{self.bai}"
-        self.full_json_records = json_load_hits(make_request(self.author_record_query))
-        # Fill in information about author's papers from the website response
-        self.inspire_records = self.get_records_dict(self.full_json_records)
-        # how many records found?
-        self.num_hits = len(self.inspire_records)
-
-        ## And finally, we use the latest inspire_record to draw even more information on the author
-        for author in self.full_json_records[0]["metadata"]["authors"]:
-            if "recid" in author.keys() and author["recid"] == self.metadata.recid:
-                self.json_metadata.update(author)
-            elif "bai" in author.keys() and author["bai"] == self.metadata.bai:
-                self.json_metadata.update(author)
-        self.metadata = metadata.author(**self.json_metadata)
-
-        # total number of citations
-        self.citations = self.get_total_number_of_citations()
-        self.citations_noself = self.get_total_number_of_citations(self_cite=False)
-
-        self.coauthors = self.get_coauthors()
-        self.coauthors_cap10 = self.get_coauthors(max_nauthors=10)
-
-        self.coauthor_records_cap10 = self.get_coauthor_records(max_nauthors=10)
+    @cached_property
+    def metadata(self) -> metadata.author:
+        """metadata of the author, completed with the author's information in the latest inspire record (e.g., affiliations)
+
+        Unlike profile_metadata (above), this requests the author's literature records if they were not requested yet.
+        """
+        json_metadata = dict(self.json_metadata)
+        if len(self.full_json_records) > 0:
+            authors = self.full_json_records[0]["metadata"]["authors"]
+            by_recid = {author["recid"]: author for author in authors if "recid" in author}
+            by_bai = {author["bai"]: author for author in authors if "bai" in author}
+            match = by_recid.get(self.profile_metadata.recid) or by_bai.get(self.bai)
+            if match:
+                json_metadata.update(_strip_dollars(match))
+        return metadata.author.from_json(json_metadata)
+
+    @cached_property
+    def _default_citation_totals(self) -> tuple:
+        return self._citation_totals()
+
+    @cached_property
+    def citations(self) -> int:
+        """total number of citations"""
+        return self._default_citation_totals[0]
+
+    @cached_property
+    def citations_noself(self) -> int:
+        """total number of citations, excluding self citations"""
+        return self._default_citation_totals[1]
+
+    @cached_property
+    def coauthors(self) -> dict:
+        return self.get_coauthors()
+
+    @cached_property
+    def _coauthor_structures_cap10(self) -> tuple:
+        return self._build_coauthor_structures(max_nauthors=10)
+
+    @cached_property
+    def coauthors_cap10(self) -> dict:
+        return self._coauthor_structures_cap10[0]
+
+    @cached_property
+    def coauthor_records_cap10(self) -> dict:
+        return self._coauthor_structures_cap10[1]
+
+    def __getitem__(self, key):
+        """get one of the author's records by texkey (e.g., author['Weinberg:1967tq']) or by position (0 is the most recent)"""
+        if isinstance(key, str):
+            return self.inspire_records[key]
+        return self.record_arrays.records[key]
+
+    def __iter__(self):
+        """iterate over the author's records, from the most recent"""
+        return iter(self.record_arrays.records)
+
+    @classmethod
+    def build_many(cls, identifiers: list, max_papers: int = 1000, max_workers: int = 8, refresh: bool = False) -> list:
+        """build_many create several Author instances concurrently
+
+        All threads share the same pooled requests session and disk cache.
+
+        Parameters
+        ----------
+        identifiers : list
+            list of author identifiers (BAI, ORCID, or Inspire record ID)
+        max_papers : int, optional
+            Number of papers requested from INSPIRE-HEP for each author, by default 1000
+        max_workers : int, optional
+            maximum number of authors being built at any given time, by default 8
+        refresh : bool, optional
+            if True, ignore cached responses and request all the data from INSPIRE-HEP again, by default False
+
+        Returns
+        -------
+        list
+            list of Author instances, in the same order as identifiers
+        """
+
+        def build(identifier):
+            author = cls(identifier, max_papers=max_papers, refresh=refresh)
+            # load the records in the worker thread too, since they are otherwise only requested when first needed
+            author.inspire_records
+            return author
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(build, identifiers))
 
     def get_total_number_of_citations(self, self_cite: bool = True, **kwargs) -> int:
         """get_total_number_of_citations
@@ -99,16 +264,32 @@ class Author:
         int
             total number of citations of the author
         """
-        count = 0
-        for record in self.inspire_records.values():
-            if not self.valid_record(record, **kwargs):
-                continue
-            else:
-                if self_cite:
-                    count += record.citation_count
-                else:
-                    count += record.ins_citation_count_without_self_citations
-        return count
+        mask = self.valid_records_mask(**kwargs)
+        if self_cite:
+            return int(self.record_arrays.citation_count[mask].sum())
+        else:
+            return int(self.record_arrays.citation_count_noself[mask].sum())
+
+    def _citation_totals(self, **kwargs) -> tuple:
+        """total number of citations with and without self citations, from a single selection of the valid records"""
+        mask = self.valid_records_mask(**kwargs)
+        return int(self.record_arrays.citation_count[mask].sum()), int(self.record_arrays.citation_count_noself[mask].sum())
+
+    def valid_records_mask(self, **kwargs) -> np.ndarray:
+        """valid_records_mask vectorized version of valid_record for all records of the author
+
+        Takes the same conditions as valid_record.
+
+        Returns
+        -------
+        np.ndarray
+            boolean array, True for records that are valid given conditions (same order as self.inspire_records)
+        """
+        return self.record_arrays.mask(**kwargs)
+
+    def _filtered(self, **kwargs) -> list:
+        """list of the records that are valid given conditions (see valid_record), computed once per set of conditions"""
+        return self.record_arrays.valid_records(**kwargs)
 
     def get_records_dict(self, json_records) -> dict:
         """get_record_json get a dictionary of all inspire records for this author
@@ -124,15 +305,7 @@ class Author:
             A dictionary containing instances of the InspireRecord class keys corresponding to the inspire texkeys
             (e.g., dic['weinberd:2002abc'])
         """
-        inspire_records = {}
-        for record in json_records:
-            try:
-                r = InspireRecord(record["metadata"])
-            except ValueError:
-                warnings.warn("Skipping record.")
-                continue
-            inspire_records[f"{r.texkey}"] = r
-        return inspire_records
+        return get_records_dict(json_records)
 
     def nice_publication_list(
         self,
@@ -146,50 +319,108 @@ class Author:
         newline: str = "\n",
         **kwargs,
     ) -> str:
-        pub_list = ""
-        list_peer_reviewed = ""
-        if split_peer_review:
-            list_nonpeerreviewed = ""
-        item = "\\item "
-        for record in self.inspire_records.values():
-            entry = ""
-            if record.author_count < author_count_to_exclude:
-                cited = record.citation_count > 0
-                well_cited = record.citation_count > def_well_cited
-                backslash_char = "\\textbf{"
-                citation = f', citations: { f"{backslash_char}" if well_cited else ""}{record.citation_count}{"}" if well_cited else ""}'
-
-                if latex_itemize:
-                    entry += item
-                if include_title:
-                    entry += f'{record.ins_titles[0]["title"]}, '
-                if arxiv:
-                    entry += record.__repr__(**kwargs)[:-1]
-                if include_citation and cited:
-                    entry += citation
-
-                entry += f".{newline}"
-
-            if split_peer_review:
-                if record.published:
-                    list_peer_reviewed += entry
-                else:
-                    list_nonpeerreviewed += entry
-            else:
-                pub_list += entry
-
-        if split_peer_review and latex_itemize:
-            pub_list += (
-                "\\textbf{Peer-reviewed publications}\n\\begin{enumerate}\n"
-                + list_peer_reviewed
-                + "\\end{enumerate}\n\\textbf{Under review or non-peer reviewed publications}\n\\begin{enumerate} \n"
-                + list_nonpeerreviewed
-                + "\\end{enumerate}"
+        # the list only depends on the arguments and on the records, so it is built once per set of arguments
+        cache_key = (
+            id(self.inspire_records),
+            include_title,
+            author_count_to_exclude,
+            include_citation,
+            def_well_cited,
+            arxiv,
+            split_peer_review,
+            latex_itemize,
+            newline,
+            tuple(sorted(kwargs.items())),
+        )
+        if cache_key in self._publication_list_cache:
+            return self._publication_list_cache[cache_key]
+
+        pub_list = "".join(
+            self.iter_publication_entries(
+                include_title=include_title,
+                author_count_to_exclude=author_count_to_exclude,
+                include_citation=include_citation,
+                def_well_cited=def_well_cited,
+                arxiv=arxiv,
+                split_peer_review=split_peer_review,
+                latex_itemize=latex_itemize,
+                newline=newline,
+                **kwargs,
             )
-        else:
-            if latex_itemize:
-                pub_list = "\\begin{enumerate}\n" + pub_list + "\\end{enumerate}"
-        return re.sub("[<].*?[>]", "", pub_list).replace("  ", " ")
+        )
+        self._publication_list_cache[cache_key] = pub_list
+        return pub_list
+
+    def iter_publication_entries(
+        self,
+        include_title: bool = True,
+        author_count_to_exclude: int = 10,
+        include_citation: bool = True,
+        def_well_cited: int = 10,
+        arxiv: bool = True,
+        split_peer_review: bool = False,
+        latex_itemize: str = False,
+        newline: str = "\n",
+        **kwargs,
+    ):
+        """iter_publication_entries generate the entries of nice_publication_list one at a time (and the latex environments around them)
+
+        Takes the same arguments as nice_publication_list, and "".join(author.iter_publication_entries(...)) is the same list.
+
+        Yields
+        ------
+        str
+            the next entry of the publication list
+        """
+        latex_split = split_peer_review and latex_itemize
+        if latex_split:
+            yield "\\textbf{Peer-reviewed publications}\n\\begin{enumerate}\n"
+        elif latex_itemize:
+            yield "\\begin{enumerate}\n"
+
+        # non-peer reviewed publications come after all the peer-reviewed ones, so they are held back
+        list_nonpeerreviewed = []
+        # records with too many authors are excluded from the list
+        for record in self.record_arrays.select(self.record_arrays.author_count < author_count_to_exclude):
+            entry = self._format_publication_entry(record, include_title, include_citation, def_well_cited, arxiv, latex_itemize, newline, **kwargs)
+            if split_peer_review and not record.published:
+                list_nonpeerreviewed.append(entry)
+            else:
+                yield entry
+
+        if latex_split:
+            yield "\\end{enumerate}\n\\textbf{Under review or non-peer reviewed publications}\n\\begin{enumerate} \n"
+        yield from list_nonpeerreviewed
+        if latex_itemize:
+            yield "\\end{enumerate}"
+
+    def _format_publication_entry(self, record, include_title, include_citation, def_well_cited, arxiv, latex_itemize, newline, **kwargs) -> str:
+        parts = []
+        if latex_itemize:
+            parts.append(_ITEM)
+        if include_title:
+            parts.append(f"{record.title}, ")
+        if arxiv:
+            parts.append(record.__repr__(**kwargs)[:-1])
+        # the citation string is only formatted for cited records
+        citation_count = record.citation_count
+        if include_citation and citation_count > 0:
+            parts.append((_CITATION_FMT_WELL_CITED if citation_count > def_well_cited else _CITATION_FMT) % citation_count)
+        parts.append(f".{newline}")
+        return _DOUBLE_SPACE.sub(" ", _HTML_TAG.sub("", "".join(parts)))
+
+    def write_publication_list(self, path: str, **kwargs) -> None:
+        """write_publication_list write the publication list to a file, one entry at a time
+
+        Parameters
+        ----------
+        path : str
+            path of the output file
+        kwargs :
+            passed on to iter_publication_entries (same arguments as nice_publication_list)
+        """
+        with open(path, "w") as f:
+            f.writelines(self.iter_publication_entries(**kwargs))
 
     def get_coauthors(self, **kwargs) -> str:
         """
@@ -218,80 +449,72 @@ class Author:
         __email__   = 'dur566@psu.edu'
         """
 
-        # dictionary of metadata author dataclasses
-        coauthors = {}
-        coauthors_joint_records = {}
-        for record in self.inspire_records.values():
-            # determine if record is to be included given certain requirements
-            if not self.valid_record(record, **kwargs):
-                continue
-            for author in record.authors.values():
-                # Exclude yourself from coauthor lists
-                if author.bai == self.bai:
-                    continue
-                # Check if this is a new author
-                if not author.bai in coauthors.keys():
-                    coauthors[author.bai] = author
-                # Coauthor is known, but might be updated
-                else:
-                    # Update the last active year and keep longer version of name
-                    if (record.date > author.last_update) or (author.full_name > coauthors[author.bai].full_name):
-                        coauthors[author.bai] = author
-        return coauthors
+        return self._build_coauthor_structures(**kwargs)[0]
 
     def get_coauthor_records(self, **kwargs) -> str:
         """
         Generates a list of all records for each coauthor
         """
+        return self._build_coauthor_structures(**kwargs)[1]
 
-        # dictionary of metadata author dataclasses
+    def _build_coauthor_structures(self, **kwargs) -> tuple:
+        """dictionaries of the coauthors (metadata author dataclasses) and of the joint records with each coauthor, in a single pass"""
+        coauthors = {}
         coauthors_joint_records = {}
-        for record in self.inspire_records.values():
-            # determine if record is to be included given certain requirements
-            if not self.valid_record(record, **kwargs):
-                continue
+        coauthors_get = coauthors.get
+        self_bai = self.bai
+        # only records that satisfy certain requirements are included
+        for record in self._filtered(**kwargs):
             for author in record.authors.values():
+                bai = author.bai
                 # Exclude yourself from coauthor lists
-                if author.bai == self.bai:
+                if bai == self_bai:
                     continue
+                existing = coauthors_get(bai)
                 # Check if this is a new author
-                if not author.bai in coauthors_joint_records.keys():
-                    coauthors_joint_records[author.bai] = [record]
-                # Coauthor is known, but new entry
-                else:
-                    coauthors_joint_records[author.bai].append(record)
-        return coauthors_joint_records
+                if existing is None:
+                    coauthors[bai] = author
+                    coauthors_joint_records[bai] = [record]
+                    continue
+                # Coauthor is known, but might be updated
+                # (update the last active year and keep longer version of name)
+                if (record.date > existing.last_update) or (author.full_name > existing.full_name):
+                    coauthors[bai] = author
+                coauthors_joint_records[bai].append(record)
+        return coauthors, coauthors_joint_records
 
     def get_coauthors_formatted(self, output_file: str = None, format: str = "nsf", **kwargs) -> str:
-        coauthors = self.coauthors if hasattr(self, "coauthors") else self.get_coauthors(**kwargs)[0]
-        if format.lower() == "nsf":
-            coauthor_csv = '"Author","Affiliation","Last Active"\n'
-        elif format.lower() == "doe":
-            coauthor_csv = '"Last Name","First Name","Affiliation","Last Active"\n'
+        # (the coauthors with the default conditions are only built once, see the coauthors property)
+        coauthors = self.get_coauthors(**kwargs) if kwargs else self.coauthors
+        # the format is only looked up once
+        header, author_row = _coauthor_format(format)
 
-        for author in coauthors.values():
-            coauthor_csv += f"{self.format_author(author, format=format)}\n"
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(author_row(author) for author in coauthors.values())
+        coauthor_csv = buffer.getvalue()
 
         if output_file is not None:
-            outfile = open(output_file, "w")
-            outfile.write(coauthor_csv)
-            outfile.close()
+            with open(output_file, "w", newline="") as outfile:
+                outfile.write(coauthor_csv)
 
         return coauthor_csv
 
     def format_author(self, author, format="NSF") -> str:
-        if format.lower() == "nsf":
-            return f'"{author.full_name}","{author.affiliation}","{author.last_update.year}"'
-        elif format.lower() == "doe":
-            return f'"{author.last_name}","{author.first_name}","{author.affiliation}","{author.last_update.year}"'
+        _, author_row = _coauthor_format(format)
+        # (written like the rows of get_coauthors_formatted, so quotes in names and affiliations are escaped)
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n").writerow(author_row(author))
+        return buffer.getvalue().rstrip("\n")
 
     def valid_record(
         self,
         record,
         only_citeable: bool = False,
         only_published: bool = False,
-        before_date: datetime.date = datetime.date.today(),
-        after_date: datetime.date = datetime.date.min,
+        before_date: datetime.date = None,
+        after_date: datetime.date = None,
         in_year: int = None,
         max_nauthors: int = 10,
         from_keys: list = None,
@@ -306,9 +529,9 @@ class Author:
         only_published : bool, optional
             if True, count records that are not published. By default True
         before_date:
-            only count records before a ceratain date (e.g datetime.date(2020, 3, 20))
+            only count records before a ceratain date (e.g datetime.date(2020, 3, 20)). By default today
         after_date:
-            only count records after a ceratain date (e.g datetime.date(2020, 3, 20))
+            only count records after a ceratain date (e.g datetime.date(2020, 3, 20)). By default no limit
         max_nauthors:
             only count records with an author count less than of max_nauthors
 
@@ -318,47 +541,131 @@ class Author:
         bool
             whether record is valid or not given conditions
         """
-        invalid = (
-            (only_citeable and not record.citeable)
-            or (only_published and not record.published)
-            or (max_nauthors is not None and record.author_count > max_nauthors)
-            or (record.date > before_date)
-            or (record.date < after_date)
-            or (in_year is not None and record.date.year != in_year)
-            or (from_keys is not None and record.texkey not in from_keys)
-            or (exclude_keys is not None and record.texkey in exclude_keys)
+        # cheapest conditions first, returning as soon as one of them fails
+        if from_keys is not None and record.texkey not in from_keys:
+            return False
+        if exclude_keys is not None and record.texkey in exclude_keys:
+            return False
+        if in_year is not None and record.date.year != in_year:
+            return False
+        if record.date > (datetime.date.today() if before_date is None else before_date):
+            return False
+        if after_date is not None and record.date < after_date:
+            return False
+        if max_nauthors is not None and record.author_count > max_nauthors:
+            return False
+        if only_citeable and not record.citeable:
+            return False
+        if only_published and not record.published:
+            return False
+        return True
+
+    def get_citations_per_year(self, year_range: tuple = None, self_cite: bool = True, cumulative: bool = False, **kwargs) -> list:
+        """get_citations_per_year total number of citations of the records published in each year
+
+        Parameters
+        ----------
+        year_range : tuple, optional
+            first year and year after the last one (as in range()), by default (2000, current year)
+        self_cite : bool, optional
+            if True, count self citations, otherwise do not. By default True
+        cumulative : bool, optional
+            if True, count the citations of all records published up to each year. By default False
+        kwargs :
+            conditions on the records (see valid_record)
+
+        Returns
+        -------
+        list
+            number of citations for each year in year_range
+        """
+        citations = self.record_arrays.citation_count if self_cite else self.record_arrays.citation_count_noself
+        return self._per_year(year_range, citations, cumulative=cumulative, **kwargs)
+
+    def get_number_of_records(self, **kwargs) -> int:
+        """get_number_of_records number of records that are valid given conditions (see valid_record)"""
+        return int(self.valid_records_mask(**kwargs).sum())
+
+    def get_publications_per_year(self, year_range: tuple = None, cumulative: bool = False, **kwargs) -> list:
+        """get_publications_per_year number of records published in each year
+
+        Parameters
+        ----------
+        year_range : tuple, optional
+            first year and year after the last one (as in range()), by default (2000, current year)
+        cumulative : bool, optional
+            if True, count all records published up to each year. By default False
+        kwargs :
+            conditions on the records (see valid_record)
+
+        Returns
+        -------
+        list
+            number of records for each year in year_range
+        """
+        return self._per_year(year_range, None, cumulative=cumulative, **kwargs)
+
+    def _per_year(self, year_range, weights, cumulative=False, **kwargs) -> list:
+        # histogram of the valid records in years (weighted by e.g. citations), in a single pass over the record arrays
+        first_year, end_year = (2000, datetime.date.today().year) if year_range is None else year_range
+        n_years = max(0, end_year - first_year)
+        mask = self.valid_records_mask(**kwargs)
+        years = self.record_arrays.year[mask]
+        if cumulative:
+            # records from before the range count towards its first year
+            years = np.maximum(years, first_year)
+        in_range = (years >= first_year) & (years < end_year)
+        counts = np.bincount(
+            years[in_range] - first_year,
+            weights=None if weights is None else weights[mask][in_range],
+            minlength=n_years,
         )
+        counts = [int(count) for count in counts]
+        # (a running sum over a few dozen years is faster in pure python)
+        return list(accumulate(counts)) if cumulative else counts
 
-        return not invalid
+    def get_bibtex(self, max_workers: int = 16, refresh: bool = False, **kwargs) -> dict:
+        """get_bibtex get the bibtex entries of the author's records, querying Inspire concurrently
 
-    def get_citations_per_year(self, year_range: tuple = (2000, datetime.date.today().year), self_cite: bool = True, **kwargs) -> list:
-        years = range(*year_range)
-        kwargs = {"max_nauthors": 10}
-        citations = []
-        for y in years:
-            citations.append(self.get_total_number_of_citations(in_year=y, self_cite=True, **kwargs))
-        return citations
+        Parameters
+        ----------
+        max_workers : int, optional
+            maximum number of requests in flight at any given time, by default 16
+        refresh : bool, optional
+            if True, request the entries from Inspire again instead of using the cached ones. By default False
 
-    def get_markdown_descriptor(self, path=".", **kwargs) -> str:
+        Returns
+        -------
+        dict
+            bibtex entries of all valid records, with keys corresponding to the inspire texkeys
+        """
+        return InspireRecord.fetch_bibtex_many(self._filtered(**kwargs), max_workers=max_workers, refresh=refresh)
+
+    def get_markdown_descriptor(self, path=".", max_workers=16, **kwargs) -> str:
         """get_markdown_descriptor this function generates a series of markdown files that can be used to generate a website
 
         Parameters
         ----------
         path : str, optional
             path where to put all markdown files, by default '.'
+        max_workers : int, optional
+            maximum number of files being written at any given time, by default 16
 
         Returns
         -------
         None
 
         """
-        md = ""
         pub_number = 1
-        # dictionary of metadata author dataclasses
-        for record in self.inspire_records.values():
-            # determine if record is to be included given certain requirements
-            if not self.valid_record(record, **kwargs):
-                continue
+        # content of the markdown files with their paths as keys, written all at once at the end
+        # (records with the same file name overwrite each other, the last one is kept)
+        md_files = {}
+        parsed = []
+        # local bindings for the loop
+        strip = strip_string
+        slug_sub = _SLUG_RE.sub
+        # only records that satisfy certain requirements are included
+        for record in self._filtered(**kwargs):
 
             # loop through the individual references in a given bibtex file
             # reset default date
@@ -368,45 +675,80 @@ class Author:
 
             pub_date = f"{pub_year}-{pub_month}-{pub_day}"
 
-            clean_title = strip_string(record.title)
+            clean_title = strip(record.title)
 
-            url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title).replace("--", "-")
+            url_slug = slug_sub("", clean_title).replace("--", "-")
 
             md_filename = f"{pub_date}-{url_slug}.md"
             html_filename = f"{pub_date}-{url_slug}"
 
             #########################################
             # citation authors
-            author_citation = ""
-            for author in record.authors.values():
-                author_citation += strip_string(f" {author.first_name} {author.last_name}, ")
+            # (names are cleaned all at once)
+            author_citation = strip("".join([f" {author.first_name} {author.last_name}, " for author in record.authors.values()]))
 
             ##########################################
             # Build Citation from text
-            citation = strip_string(f"{record.__repr__(include_title=True, cap_author_list = 10, include_arxiv=False)[:-1]}")
-            citation = strip_string(citation)
-
-            citation_notitle = strip_string(f"{record.__repr__(include_title=False, cap_author_list = 10, include_arxiv=False)[:-1]}")
-            citation_notitle = strip_string(citation_notitle)
+            citation = strip(record.__repr__(include_title=True, cap_author_list=10, include_arxiv=False)[:-1])
+            citation_notitle = strip(record.__repr__(include_title=False, cap_author_list=10, include_arxiv=False)[:-1])
             ##########################################
             ## YAML variables
-            md = f"---\ntitle: '{clean_title}'\n"
-            md += f"pub_number: {pub_number}\n"
-            md += f"authors: {author_citation[:-2]}\n"
-            md += "collection: publication"
-            md += f"\npermalink: /publication/{html_filename}"
-            md += f"\ndate: {pub_date}"
-            md += f"\nvenue: {strip_string(record.pub_title)} "
+            md_lines = [
+                "---",
+                f"title: '{clean_title}'",
+                f"pub_number: {pub_number}",
+                f"authors: {author_citation[:-2]}",
+                "collection: publication",
+                f"permalink: /publication/{html_filename}",
+                f"date: {pub_date}",
+                f"venue: {strip(record.pub_title)} ",
+            ]
             if record.arxiv_number is not None:
-                md += f"\npaperurl: '{record.arxiv_url}'"
-            md += f"\ncitation_notitle: '{citation_notitle}'"
-            md += f"\ncitation: '{citation}'"
+                md_lines.append(f"paperurl: '{record.arxiv_url}'")
+            md_lines.append(f"citation_notitle: '{citation_notitle}'")
+            md_lines.append(f"citation: '{citation}'")
             if record.arxiv_number is not None:
-                md += f"\neprint: '{record.arxiv_number}'\n"
-            md += "\n---"
+                md_lines.extend([f"eprint: '{record.arxiv_number}'", ""])
+            md_lines.append("---")
+            md = "\n".join(md_lines)
             md_filename = os.path.basename(md_filename)
 
-            with open(f"{path}/{md_filename}", "w") as f:
-                f.write(md)
-            print(f"SUCESSFULLY PARSED {citation}")
+            md_files[f"{path}/{md_filename}"] = md
+            parsed.append(f"SUCESSFULLY PARSED {citation}")
             pub_number += 1
+
+        # file writes release the GIL, so they overlap in threads
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(lambda md_file: _write_file(*md_file), md_files.items()))
+        if parsed:
+            print("\n".join(parsed))
+
+
+def _write_file(path: str, content: str) -> None:
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def build_authors(identifiers: list, max_papers: int = 1000, max_workers: int = 8, refresh: bool = False) -> dict:
+    """build_authors create Author instances for several identifiers concurrently (e.g., for a group or collaboration page)
+
+    Same as Author.build_many, but returning a dictionary and building repeated identifiers only once.
+
+    Parameters
+    ----------
+    identifiers : list
+        list of author identifiers (BAI, ORCID, or Inspire record ID). Repeated identifiers are only built once.
+    max_papers : int, optional
+        Number of papers requested from INSPIRE-HEP for each author, by default 1000
+    max_workers : int, optional
+        maximum number of authors being built at any given time, by default 8
+    refresh : bool, optional
+        if True, ignore cached responses and request all the data from INSPIRE-HEP again, by default False
+
+    Returns
+    -------
+    dict
+        Author instances with the identifiers as keys
+    """
+    identifiers = list(dict.fromkeys(identifiers))
+    return dict(zip(identifiers, Author.build_many(identifiers, max_papers=max_papers, max_workers=max_workers, refresh=refresh)))
@@ -1,10 +1,6 @@
-import warnings
-import requests
-import numpy as np
-import json
 import datetime
 
-from inspyhep.literature_tools import InspireRecord, make_request, json_load_hits
+from inspyhep.literature_tools import RecordArrays, get_paged_hits, get_records_dict, LITERATURE_FIELDS
 
 class Institution():
     def __init__(self, identifier, max_hits: int = 1000):
@@ -23,19 +19,61 @@ class Institution():
         self.snapshot_date = datetime.datetime.now()
         self.max_hits = max_hits
 
-        # Query Inspire-HEP for institutions's information
-        self.institution_query = f'https://inspirehep.net/api/institutions?size={self.max_hits}&q={self.identifier}'
+        # Query Inspire-HEP for the literature records of the institution
+        self.institution_query = f'https://inspirehep.net/api/literature?sort=mostrecent&fields={LITERATURE_FIELDS}&q=affid%20{self.identifier}'
 
-        self.full_record = self.get_full_records_from_query()
-        self.full_json_records = json_load_hits(self.full_record)
+        self.full_json_records = self.get_full_records_from_query(self.institution_query)
 
         # how many records found?
         self.num_hits = len(self.full_json_records)
 
         # Fill in information about author's papers from the website response
         self.inspire_records = self.get_records_dict(self.full_json_records)
+        # the same properties as numpy arrays, so that totals are vectorized sums
+        self.record_arrays = RecordArrays(self.inspire_records)
 
         # total number of citations
         self.citations = self.get_total_number_of_citations(self.inspire_records, )
         self.citations_noself = self.get_total_number_of_citations(self.inspire_records, self_cite=False)
 
+    def get_full_records_from_query(self, query: str) -> list:
+        """get_full_records_from_query get all hits of query, requesting pages of results concurrently
+
+        Parameters
+        ----------
+        query : str
+            url with query to be used by requests.get() (without size or page parameters)
+
+        Returns
+        -------
+        list
+            the list of hits found (at most self.max_hits).
+        """
+        return get_paged_hits(query, self.max_hits)
+
+    def get_records_dict(self, json_records: list) -> dict:
+        """get_records_dict get a dictionary of all inspire records for this institution"""
+        return get_records_dict(json_records)
+
+    def get_total_number_of_citations(self, records: dict, self_cite: bool = True) -> int:
+        """get_total_number_of_citations
+
+        Parameters
+        ----------
+        records : dict
+            dictionary of InspireRecord instances
+        self_cite : bool, optional
+            if True, count self citations, otherwise do not. By default True
+
+        Returns
+        -------
+        int
+            total number of citations of the records
+        """
+        if records is self.inspire_records:
+            counts = self.record_arrays.citation_count if self_cite else self.record_arrays.citation_count_noself
+            return int(counts.sum())
+        if self_cite:
+            return sum(record.citation_count for record in records.values())
+        else:
+            return sum(record.citation_count_no_self for record in records.values())
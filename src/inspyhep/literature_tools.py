@@ -1,49 +1,190 @@
 import warnings
-from inspect import signature
+import dataclasses
 from typing import Union
 import json
 import requests
-from pylatexenc.latexencode import unicode_to_latex
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import datetime
 import time
+import threading
+import os
+import hashlib
+import re
+import gzip
+import math
+from functools import lru_cache, cached_property
+from weakref import WeakValueDictionary
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 from inspyhep import metadata
 
+# orjson is a much faster drop-in for json.loads and parses bytes directly
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Inspire literature fields read by InspireRecord -- requesting only these with `fields=`
+# avoids downloading and parsing references, abstracts, figures, etc.
+LITERATURE_FIELDS = ','.join([
+    'texkeys',
+    'titles',
+    'document_type',
+    'earliest_date',
+    'preprint_date',
+    'publication_info',
+    'first_author',
+    'author_count',
+    'authors',
+    'citeable',
+    'arxiv_eprints',
+    'primary_arxiv_category',
+    'citation_count',
+    'citation_count_without_self_citations',
+])
+
+# maximum number of hits Inspire returns in a single page of results
+MAX_PAGE_SIZE = 250
+
+# author properties that InspireRecord keeps as lists (authors_{prop}, built when first accessed)
+_AUTHOR_PROPS = tuple(f.name for f in dataclasses.fields(metadata.author))
+
+# text fields of the author dataclass (and the affiliation derived from them) from which _strip_author_dollars drops $
+_AUTHOR_TEXT_FIELDS = tuple(f.name for f in dataclasses.fields(metadata.author) if f.type is str) + ('affiliation',)
+
+# Inspire document types that InspireRecord counts (and prints) as proceedings
+_PROCEEDINGS_TYPES = frozenset(['conference paper', 'proceedings', 'report'])
+
+# a dot, and the space after it if there is one (initials are normalized to 'A. B. ')
+_INITIALS_RE = re.compile(r'\. ?')
+# year in a texkey (e.g., 'Weinberg:1967tq' -> '1967')
+_TEXKEY_YEAR_RE = re.compile(r'[^:]*:(\d{4})')
+# dates of Inspire records ('YYYY', 'YYYY-MM' or 'YYYY-MM-DD')
+_DATE_RE = re.compile(r'(\d{4})(?:-(\d{1,2}))?(?:-(\d{1,2}))?')
+# spaces before commas and periods, and runs of spaces (cleaned up in InspireRecord.__repr__)
+_REPR_SPACES_RE = re.compile(r' +([,.])| {2,}')
+
+# Inspire answers with 429 (too many requests) beyond 15 requests in 5s. Requests to Inspire draw from
+# a token bucket shared by all threads, holding up to RATE_LIMIT_BURST tokens and refilled at RATE_LIMIT_PER_SECOND,
+# so that at most RATE_LIMIT_BURST + 5 * RATE_LIMIT_PER_SECOND = 15 requests are sent in any 5s.
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_PER_SECOND = 2
+
+
+class _RateLimiter:
+    """Thread-safe token bucket (a negative number of tokens is the queue of threads waiting for their turn)."""
+
+    def __init__(self, per_second: float, burst: int):
+        self.per_second = per_second
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.per_second)
+        self._updated = now
+
+    def acquire(self):
+        """acquire wait until a request can be sent"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            wait = -self._tokens / self.per_second
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """pause hold back all requests for the next `seconds` (e.g., asked to by a 429 response)"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0) - seconds * self.per_second
+
+
+_RATE_LIMITER = _RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+# seconds to wait after a 429 response without a Retry-After header (the length of Inspire's rate limit window)
+TOO_MANY_REQUESTS_WAIT = 5
+
+
+class _InspireRetry(Retry):
+    """urllib3 Retry that, on 429 (too many requests), holds back the requests of all threads and not only the refused one."""
+
+    def sleep(self, response=None):
+        if response is not None and response.status == 429:
+            wait = self.get_retry_after(response)
+            wait = TOO_MANY_REQUESTS_WAIT if wait is None else wait
+            warnings.warn(f"You have exceeded the number of requests in 5s set by Inspire. Waiting {wait:g}s to try again.")
+            _RATE_LIMITER.pause(wait)
+            time.sleep(wait)
+        else:
+            super().sleep(response)
+
+
+# A single session keeps connections to inspirehep.net alive, so TCP and TLS handshakes are done once
+# (the pool is large enough for the worker threads of get_paged_hits, bulk_from_texkeys and fetch_bibtex_many to reuse connections)
+_SESSION = requests.Session()
+_SESSION.headers['Accept-Encoding'] = 'gzip'
+# connection errors, server errors and too many requests are retried by urllib3
+# (with exponential backoff, or as long as Inspire asks in the Retry-After header)
+_RETRY = _InspireRetry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+_SESSION.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=_RETRY))
+# time in seconds to wait for Inspire's response
+REQUEST_TIMEOUT = 30
+
+# Responses from Inspire are cached on disk, so repeated queries do not hit the network
+CACHE_DIR = os.environ.get('INSPYHEP_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'inspyhep'))
+# set INSPYHEP_NO_CACHE (to anything but 0) to neither read nor write the disk cache
+NO_CACHE = os.environ.get('INSPYHEP_NO_CACHE', '0') not in ('', '0')
+# time in seconds after which a cached response is requested again (None means never)
+# (records requested by texkey expire too, since they include citation counts)
+CACHE_EXPIRE_AFTER = 3600
+# cached responses are gzip-compressed (json responses shrink ~10x), with a fast compression level
+CACHE_COMPRESS_LEVEL = 1
+# parsed hits of recent queries are also kept in memory (query: (time of request, hits)), up to MEMO_MAX_SIZE queries
+# (shared by worker threads, so it is only read and updated while holding _HITS_MEMO_LOCK)
+_HITS_MEMO = OrderedDict()
+_HITS_MEMO_LOCK = threading.Lock()
+MEMO_MAX_SIZE = 256
+# bibtex entries obtained within the session (texkey: bibtex)
+_BIBTEX_MEMO = {}
+# InspireRecord instances alive in the session, with the texkeys as keys, so that records shared by several authors are only built once
+_RECORD_POOL = WeakValueDictionary()
+
 class InspireRecord:
-    """Class for storing Inspire record information."""
+    """Class for storing Inspire record information.
 
-    def __init__(self, input: Union[dict,str], cap_authors: int =100):
+        When a texkey is passed, the record is requested from Inspire. The full record is requested
+        unless `fields` restricts it (e.g., fields=LITERATURE_FIELDS requests only what InspireRecord uses).
+    """
+
+    def __init__(self, input: Union[dict,str], cap_authors: int =100, fields: str = None):
 
         self.input = input
         # if texkey was passed, then request json info from Inspire API
         if type(self.input) is str:
-            _content = self.get_record_from_inspire_query(texkey=self.input)
-            _records_found = json_load_hits(_content)
-            if len(_records_found)>1:
-                warnings.warn(f'More than one record found with key = {self.input}. Reading the first one.')
-                _records_found = [_records_found[0]]
-            elif len(_records_found)==0:
-                raise ValueError(f"No record found with requests.get({self.record_query}) for input texkey '{self.input}'")
-            else:
-                self.json_record = _records_found[0]['metadata']
+            self.json_record = self._fetch_metadata(texkey=self.input, fields=fields)
         # else, assume we have the json data already
         else:
             self.json_record = self.input
 
         self._cap_authors = cap_authors
 
-        # Load all inspire record attributes as "ins_{key}"
-        for key in self.json_record.keys():
-            setattr(self, f'ins_{key}', self.json_record[key])
+        # (all inspire record attributes are accessible as "ins_{key}", see __getattr__)
 
         # main key that identifies a record (used by latex)
         try:
-            self.texkey = self.ins_texkeys[0]
-        except AttributeError:
+            self.texkey = self.json_record['texkeys'][0]
+        except (KeyError, IndexError):
             raise ValueError(f"No texkey found for record {self.json_record}.")
 
         # title
-        self.title = self.ins_titles[0]['title'] if hasattr(self, 'ins_titles') else None
+        # (latex math delimiters are dropped from all text read from the record, e.g., '$\\nu$STORM' -> '\\nuSTORM', see _strip_dollars)
+        self.title = _strip_dollars((self.json_record.get('titles') or [{}])[0].get('title'))
 
         ''' Date information. Tries the following:
             1 - Inspire earliest_date
@@ -51,127 +192,192 @@ class InspireRecord:
             3 - Journal
             4 - info in texkeys
         '''
-        try:
-            self.year, self.month, self.day = self.get_date(self.json_record['earliest_date'])
-        except KeyError:
+        _date = self.json_record.get('earliest_date') or self.json_record.get('preprint_date')
+        # (the first entry of the publication info, if any)
+        _pub_info = (self.json_record.get('publication_info') or [{}])[0]
+        if _date:
+            self.year, self.month, self.day = self.get_date(_date)
+        elif _pub_info.get('year'):
+            self.year, self.month, self.day = int(_pub_info['year']), 1, 1
+        else:
             try:
-                self.year, self.month, self.day = self.get_date(self.json_record['preprint_date'])
-            except KeyError:
-                try:
-                    self.year, self.month, self.day = int(self.json_record['publication_info'][0]['year']), 1, 1
-                except KeyError:
-                    try:
-                        self.year, self.month, self.day = self.get_year_from_texkeys(self.json_record['texkeys']), 1, 1
-                    except KeyError:
-                        warnings.warn("No date found in Inspire record.")
-                        self.year = 1
-                        self.month = 1
-                        self.day = 1
+                self.year, self.month, self.day = self.get_year_from_texkeys(self.texkey), 1, 1
+            except ValueError:
+                warnings.warn("No date found in Inspire record.")
+                self.year = 1
+                self.month = 1
+                self.day = 1
 
-        self.date = datetime.date(int(self.year), int(self.month), int(self.day))
+        self.date = make_date(self.year, self.month, self.day)
 
 
         # main key that identifies a record (used by latex)
-        self.document_type = self.ins_document_type[0]
+        self.document_type = self.json_record['document_type'][0]
 
-        # first author
-        self.first_author = unicode_to_latex(self.ins_first_author['full_name'])
-        
         # number of authors
-        self.author_count = self.ins_author_count
+        self.author_count = self.json_record['author_count']
         
         # create a dictionary of author dataclasses
+        authors = self.json_record['authors']
         self.authors = {}
-        for a in self.ins_authors:
-            meta = metadata.author(**a)
+        for a in authors:
+            meta = _strip_author_dollars(metadata.author.from_json(a))
             self.authors[meta.bai] = meta
             self.authors[meta.bai].last_update = self.date
 
-        # This loops over all possible author properties and creates lists of these for all authors of this record
-        # called authors_{prop} (e.g., authors_first_name = ['Alice', 'Bob'])
-        for prop in signature(metadata.author).parameters.keys():
-            if prop == 'affiliations':
-                setattr(self, f'authors_{prop}', [ a[prop][0]["value"] if prop in a.keys() else '' for a in self.ins_authors])
-            else:
-                setattr(self, f'authors_{prop}', [ a[prop] if prop in a.keys() else '' for a in self.ins_authors])
-
-        # 'Salam, G. and Weinber, S.'
-        self.authorlist = self.get_authorlist()
-        # 'G. Salam, and S. Weinberg'
-        self.authorlist_bibtex_style = self.get_authorlist_bibtex_style()
-        
-        self.capped_at_1_authorlist = f'{self.authors_last_name[0]} et al'
-        self.capped_at_3_authorlist = self.get_authorlist(cap=3, first_name=False)
-
-        self.capped_at_1_authorlist_full_name = self.get_authorlist(cap=1)
-        self.capped_at_3_authorlist_full_name = self.get_authorlist(cap=3)
+        # (lists of each author property for all authors of this record, called authors_{prop}
+        # (e.g., authors_first_name = ['Alice', 'Bob']), are built when first accessed, see __getattr__)
 
+        # (author lists and other derived strings are only built when first needed, see the properties below)
 
         # Title of the Journal
-        try:
-            self.pub_title = self.json_record['publication_info'][0]['journal_title']
-        except KeyError:
-            self.pub_title = ''
+        self.pub_title = _strip_dollars(_pub_info.get('journal_title', ''))
 
         # Journal Volume
-        try:
-            self.pub_volume = self.json_record['publication_info'][0]['journal_volume']
-        except KeyError:
-            self.pub_volume = ''
+        self.pub_volume = _strip_dollars(_pub_info.get('journal_volume', ''))
 
         # Journal Issue
-        try:
-            self.pub_issue = self.json_record['publication_info'][0]['journal_issue']
-        except KeyError:
-            self.pub_issue = ''
+        self.pub_issue = _strip_dollars(_pub_info.get('journal_issue', ''))
 
         # Journal article id
-        try:
-            self.pub_artid = self.json_record['publication_info'][0]['artid']
-        except KeyError:
-            self.pub_artid = ''
+        self.pub_artid = _strip_dollars(_pub_info.get('artid', ''))
 
         # publication id 
-        try:
-            self.pub_year = int(self.json_record['publication_info'][0]['year'])
-        except KeyError:
-            self.pub_year = ''
+        self.pub_year = int(_pub_info['year']) if 'year' in _pub_info else ''
 
         # Is it published
         self.published = (len(self.pub_title)>0)
         self.journal = self.pub_title if self.published else None
-        self.pub_info = f'{self.pub_title} {self.pub_volume} ({self.pub_year}) {self.pub_issue} {self.pub_artid}' if self.published else None
 
         # Is it a proceedings?
-        self.proceedings = (['document_type'] == 'conference paper')
+        self.proceedings = self.document_type in _PROCEEDINGS_TYPES
         # Is it citeable according to inspire? (can be reliably tracked)
-        self.citeable = self.ins_citeable if hasattr(self, 'ins_citeable') else False
+        self.citeable = self.json_record.get('citeable', False)
 
         # arXiv number (xxxx.yyyyy)
-        try:
-            self.arxiv_number = self.json_record['arxiv_eprints'][0]['value']
-        except KeyError:
-            self.arxiv_number = None
+        self.arxiv_number = (self.json_record.get('arxiv_eprints') or [{}])[0].get('value')
         
         # arXiv category (e.g., hep-ph)
-        try:
-            self.primary_arxiv_category = self.json_record['primary_arxiv_category']
-        except KeyError:
-            self.primary_arxiv_category = None
+        self.primary_arxiv_category = self.json_record.get('primary_arxiv_category')
+
+        self.citation_count = self.json_record['citation_count']
+        self.citation_count_no_self = self.json_record['citation_count_without_self_citations']
+
+    def __getattr__(self, name: str):
+        # inspire record attributes "ins_{key}" are read from the json record, and the lists of author properties
+        # "authors_{prop}" are built, the first time they are accessed
+        # (only called for attributes not found otherwise; json_record is read from __dict__ to avoid recursing here)
+        json_record = self.__dict__.get('json_record')
+        if json_record is not None:
+            # (keys that Inspire prefixes with $ are also accessible without it, e.g., ins_schema for '$schema')
+            if name.startswith('ins_'):
+                for key in (name[4:], f'${name[4:]}'):
+                    if key in json_record:
+                        # (kept on the instance, so that the value is stripped once and is the same object on every access)
+                        value = self.__dict__[name] = _strip_dollars(json_record[key])
+                        return value
+            elif name.startswith('authors_') and name[8:] in _AUTHOR_PROPS:
+                prop = name[8:]
+                if prop == 'affiliations':
+                    # (authors with an empty list of affiliations have no affiliation)
+                    values = [_strip_dollars(a[prop][0]["value"]) if a.get(prop) else '' for a in json_record['authors']]
+                else:
+                    values = [_strip_dollars(a.get(prop, '')) for a in json_record['authors']]
+                # (kept on the instance, so that __getattr__ is not called again for this list)
+                self.__dict__[name] = values
+                return values
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __dir__(self):
+        ins_keys = (f"ins_{key.lstrip('$')}" for key in self.__dict__.get('json_record', {}))
+        return [*super().__dir__(), *ins_keys, *(f'authors_{prop}' for prop in _AUTHOR_PROPS)]
+
+    @cached_property
+    def first_author(self) -> str:
+        """full name of the first author, encoded in latex"""
+        return latex_encode(_strip_dollars(self.json_record['first_author']['full_name']))
 
-        # arxiv url
+    @cached_property
+    def authorlist(self) -> str:
+        """'Salam, G. and Weinber, S.'"""
+        return self.get_authorlist()
+
+    @cached_property
+    def authorlist_bibtex_style(self) -> str:
+        """'G. Salam, and S. Weinberg'"""
+        return self.get_authorlist_bibtex_style()
+
+    @cached_property
+    def capped_at_1_authorlist(self) -> str:
+        return f'{self.authors_last_name[0]} et al'
+
+    @cached_property
+    def capped_at_3_authorlist(self) -> str:
+        return self.get_authorlist(cap=3, first_name=False)
+
+    @cached_property
+    def capped_at_1_authorlist_full_name(self) -> str:
+        return self.get_authorlist(cap=1)
+
+    @cached_property
+    def capped_at_3_authorlist_full_name(self) -> str:
+        return self.get_authorlist(cap=3)
+
+    @cached_property
+    def _initials_full_names(self) -> list:
+        """'First Last' of each author with initials normalized (each name is normalized only once per record)"""
+        return [self.name_force_initials(f'{f} {l}') for f,l in zip(self.authors_first_name,self.authors_last_name)]
+
+    @cached_property
+    def _initials_last_names(self) -> list:
+        """last name of each author with initials normalized"""
+        return [self.name_force_initials(l) for l in self.authors_last_name]
+
+    @cached_property
+    def pub_info(self) -> str:
+        """journal, volume, year, issue and article id of published records (None if not published)"""
+        return f'{self.pub_title} {self.pub_volume} ({self.pub_year}) {self.pub_issue} {self.pub_artid}' if self.published else None
+
+    @cached_property
+    def arxiv_url(self) -> str:
+        """url of the arXiv abstract page (None if not on arXiv)"""
         if self.arxiv_number is not None:
-            self.arxiv_url = f'https://arxiv.org/abs/{self.arxiv_number}'
-        else:
-            self.arxiv_url = None
+            return f'https://arxiv.org/abs/{self.arxiv_number}'
+        return None
+
+    @property
+    def bibtex_query(self) -> str:
+        """bibtex_query url of the Inspire API query for the bibtex entry of this record"""
+        return f"https://inspirehep.net/api/literature?q=texkeys:{self.texkey}&format=bibtex"
+
+    def get_bibtex(self, refresh: bool = False) -> str:
+        """get_bibtex get the bibtex entry for a record from the Inspire key (request it again if refresh is True)"""
+        return get_bibtex_from_key(self.texkey, refresh=refresh)
+
+    @staticmethod
+    def fetch_bibtex_many(records: list, max_workers: int = 8, refresh: bool = False) -> dict:
+        """fetch_bibtex_many get the bibtex entries of several records, querying Inspire concurrently
+
+            Inspire returns bibtex one record at a time, so the requests are overlapped in a pool of threads instead.
 
-        self.citation_count = self.ins_citation_count
-        self.ins_citation_count_without_self_citations = self.ins_citation_count_without_self_citations
-        self.citation_count_no_self = self.ins_citation_count_without_self_citations
+        Parameters
+        ----------
+        records : list
+            InspireRecord instances
+        max_workers : int, optional
+            maximum number of requests in flight at any given time, by default 8
+        refresh : bool, optional
+            if True, request the entries from Inspire again instead of using the cached ones. By default False
 
-    def get_bibtex(self) -> str:
-        """get_bibtex get the bibtex entry for a record from the Inspire key"""
-        return make_request(f"https://inspirehep.net/api/literature?q=texkeys:{self.texkey}&format=bibtex")
+        Returns
+        -------
+        dict
+            bibtex entries of the records, with the inspire texkeys as keys
+        """
+        records = list(records)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            bibtex_entries = list(executor.map(lambda record: record.get_bibtex(refresh=refresh), records))
+        return {record.texkey: bibtex for record, bibtex in zip(records, bibtex_entries)}
     
     def arxiv_url_builder(self, name: str, format: str = 'latex') -> str:
         
@@ -225,7 +431,7 @@ class InspireRecord:
             _repr = f'{authors_shown}, {self.pub_info}{arxiv_suffix}.'
         elif self.document_type == 'article':
             _repr = f'{authors_shown}, preprint, {self.year}{arxiv_suffix}.'
-        elif self.document_type == 'conference paper' or self.document_type == 'proceedings' or self.document_type == 'report':
+        elif self.document_type in _PROCEEDINGS_TYPES:
             _repr = f'{authors_shown}, proceedings, {self.year}{arxiv_suffix}.'
         elif self.document_type == 'thesis':
             _repr = f'{authors_shown}, thesis, {self.year}{arxiv_suffix}.'
@@ -233,26 +439,24 @@ class InspireRecord:
             _repr = f'{authors_shown}, {self.year}{arxiv_suffix}.'
         if include_title:
             _repr = f'{self.title}, {_repr}'
-        return _repr.replace("   ", " ").replace("  ", " ").replace(" ,", ",").replace(" .", ".")
+        return _REPR_SPACES_RE.sub(lambda match: match.group(1) or ' ', _repr)
 
     def get_date(self, date: str) -> tuple:
-        try:
-            y, m, d = date.split(sep='-')
-        except ValueError:
-            try:
-                y, m = date.split(sep='-')
-                d = '1'
-            except ValueError:
-                y = date
-                m = '1'
-                d = '1'
-        return y, m, d
+        # (month and day are 1 if missing)
+        match = _DATE_RE.match(date)
+        if match is None:
+            raise ValueError(f"Could not read the date '{date}'.")
+        y, m, d = match.groups()
+        return int(y), int(m or 1), int(d or 1)
 
     def get_year_from_texkeys(self, texkey: str) -> int:
-        return int(texkey.partition(":")[2][:4])
+        match = _TEXKEY_YEAR_RE.match(texkey)
+        if match is None:
+            raise ValueError(f"No year found in texkey '{texkey}'.")
+        return int(match.group(1))
 
     def name_force_initials(self, name: str) -> str:
-        return name.replace(". ",".").replace(".",". ")
+        return _INITIALS_RE.sub('. ', name)
 
     def get_authorlist(self, cap: int = 10, first_name: bool = True) -> str:
         
@@ -260,18 +464,8 @@ class InspireRecord:
             return f'{self.authors_last_name[0]} {"et al" if self.author_count > 1 else ""}'
         else:
             nauthors = min(self.author_count, cap)
-            # string of author lists in different formats 
-            _full_author_list = [] 
-            for f,l in zip(self.authors_first_name[:nauthors-1],self.authors_last_name[:nauthors-1]):
-                if first_name:
-                    _full_author_list.append(self.name_force_initials(f'{f} {l}, '))
-                else:
-                    _full_author_list.append(self.name_force_initials(f'{l}, '))
-            if first_name:
-                last_entry = self.name_force_initials(f'{self.authors_first_name[-1]} {self.authors_last_name[-1]}')
-            else:
-                last_entry = self.name_force_initials(f'{self.authors_last_name[-1]}')
-            return ''.join(_full_author_list) + last_entry
+            names = self._initials_full_names if first_name else self._initials_last_names
+            return ', '.join(names[:nauthors])
 
     def get_authorlist_bibtex_style(self, cap: int = 2000) -> str:
         
@@ -279,38 +473,190 @@ class InspireRecord:
             return f'{self.authors_last_name[0]} {"et al" if self.author_count > 1 else ""}'
         else:
             if self.author_count > 10:
-                warnings.warn("Capping at 10 authors in record {self.texkey}.")
+                warnings.warn(f"Capping at 10 authors in record {self.texkey}.")
                 cap = 10
-            else:
-                nauthors = min(self.author_count, cap)
-                _full_author_list_bibtex_style = [] 
-                for f in self.authors_full_name[:nauthors-1]:
-                    _full_author_list_bibtex_style.append(f'{f} and ')
-                return ''.join(_full_author_list_bibtex_style) + f'{self.authors_full_name[-1]}'
+            nauthors = min(self.author_count, cap)
+            return ' and '.join(self.authors_full_name[:nauthors])
 
 
-    def get_record_from_inspire_query(self, texkey: str) -> str:
+    @classmethod
+    def bulk_from_texkeys(cls, texkeys: list, batch: int = 25, max_workers: int = 8) -> dict:
+        """bulk_from_texkeys get the records of several texkeys, requesting batches of texkeys in a single Inspire query
+
+            Only the record fields used by InspireRecord (LITERATURE_FIELDS) are requested.
+
+        Parameters
+        ----------
+        texkeys : list
+            tex keys of the records (e.g., ['Weinberg:1967tq', 'Salam:1968rm'])
+        batch : int, optional
+            number of texkeys requested in each query, by default 25
+        max_workers : int, optional
+            maximum number of batch queries in flight at any given time, by default 8
+
+        Returns
+        -------
+        dict
+            InspireRecord instances with the requested texkeys as keys (texkeys with no record found are left out)
+        """
+        texkeys = list(dict.fromkeys(texkeys))
+        wanted = set(texkeys)
+        found = {}
+        queries = []
+        for start in range(0, len(texkeys), batch):
+            keys = texkeys[start : start + batch]
+            queries.append(f"https://inspirehep.net/api/literature?size={len(keys)}&fields={LITERATURE_FIELDS}&q={'%20or%20'.join(f'texkeys:{key}' for key in keys)}")
+
+        # the batches are independent, so they are requested concurrently over the shared session
+        if len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batches = list(executor.map(get_hits, queries))
+        else:
+            batches = [get_hits(query) for query in queries]
+
+        for hits in batches:
+            for hit in hits or []:
+                if not cls.can_parse(hit['metadata']):
+                    continue
+                # (shared with the records of authors and institutions in the session, see pooled_record)
+                record = pooled_record(hit['metadata'])
+                # a record can be found through any of its texkeys
+                for key in record.json_record['texkeys']:
+                    if key in wanted:
+                        found[key] = record
+
+        missing = [key for key in texkeys if key not in found]
+        if missing:
+            warnings.warn(f"No record found for texkeys {missing}.")
+        return {key: found[key] for key in texkeys if key in found}
+
+    @staticmethod
+    def can_parse(json_record: dict) -> bool:
+        """can_parse check that a json record has what InspireRecord needs (i.e., a texkey)"""
+        return bool(json_record.get('texkeys'))
+
+    def _fetch_metadata(self, texkey: str, fields: str = None) -> dict:
+        """_fetch_metadata get the json metadata of the Inspire record with a given texkey
+
+            The response bytes are parsed straight into the list of hits (no intermediate str).
+            If several records share the texkey, the first one is used.
+        """
+        _records_found = json_load_hits(self.get_record_from_inspire_query(texkey=texkey, fields=fields))
+        # (a failed request gives no hits, after a warning)
+        if not _records_found:
+            raise ValueError(f"No record found with requests.get({self.record_query}) for input texkey '{texkey}'")
+        elif len(_records_found)>1:
+            warnings.warn(f'More than one record found with key = {texkey}. Reading the first one.')
+        return _records_found[0]['metadata']
+
+    def get_record_from_inspire_query(self, texkey: str, fields: str = None) -> bytes:
         """get_record_from_inspire_query get the Inspire record from url
 
         Parameters
         ----------
         texkey : str
             tex key of the record to be used in the Inspire API query
+        fields : str, optional
+            comma-separated record fields Inspire should return, by default None (the full record)
 
         Returns
         -------
-        str
-            full string output from the Inpires query
+        bytes
+            full output from the Inpires query
         """
         # Query Inspire-HEP for author's information
         _inspire_query = 'https://inspirehep.net/api/literature'
         self.record_query = f'{_inspire_query}?q=texkeys:{texkey}'
+        if fields:
+            self.record_query += f'&fields={fields}'
 
-        return make_request(self.record_query)
+        return make_request(self.record_query, decode=False)
 
 
-def make_request(query: str) -> str:
-    """make_request make request to website
+def _strip_dollars(value):
+    """_strip_dollars drop latex math delimiters ($) from text read from Inspire (and from the strings in lists and dicts of text)
+
+        Only the text that reaches the formatted output is stripped, so the raw responses (e.g., bibtex entries) keep their $.
+    """
+    if isinstance(value, str):
+        return value.replace('$', '')
+    elif isinstance(value, list):
+        return [_strip_dollars(item) for item in value]
+    elif isinstance(value, dict):
+        return {key: _strip_dollars(item) for key, item in value.items()}
+    return value
+
+
+def _strip_author_dollars(author: metadata.author) -> metadata.author:
+    """_strip_author_dollars drop $ from the text fields of an author dataclass, in place
+
+        Only the fields that from_json kept are stripped, instead of copying the whole json of the author.
+    """
+    for name in _AUTHOR_TEXT_FIELDS:
+        value = getattr(author, name)
+        if isinstance(value, str) and '$' in value:
+            setattr(author, name, value.replace('$', ''))
+    return author
+
+
+@lru_cache(maxsize=4096)
+def latex_encode(text: str) -> str:
+    """latex_encode encode unicode text in latex (e.g., 'Schrödinger' -> 'Schr\\"odinger'), memoized for repeated author names
+
+        pylatexenc is only imported the first time it is needed.
+    """
+    from pylatexenc.latexencode import unicode_to_latex
+
+    return unicode_to_latex(text)
+
+
+@lru_cache(maxsize=4096)
+def make_date(year: int, month: int, day: int) -> datetime.date:
+    """make_date datetime.date of a record, memoized (many records share a date, e.g., the 1st of January of their year)
+
+        dates are immutable, so records with the same date can share a single instance.
+    """
+    return datetime.date(year, month, day)
+
+
+def get_bibtex_from_key(texkey: str, refresh: bool = False) -> str:
+    """get_bibtex_from_key get the bibtex entry for a record from the Inspire key (memoized within the session)
+
+        Failed requests (None) are not memoized, so they are requested again the next time.
+
+    Parameters
+    ----------
+    texkey : str
+        tex key of the record (e.g., 'Weinberg:1967tq')
+    refresh : bool, optional
+        if True, ignore the memoized entry and the disk cache and request the entry from Inspire again. By default False
+
+    Returns
+    -------
+    str
+        the bibtex entry (None if it could not be obtained)
+    """
+    if not refresh and texkey in _BIBTEX_MEMO:
+        return _BIBTEX_MEMO[texkey]
+    bibtex = make_request(f"https://inspirehep.net/api/literature?q=texkeys:{texkey}&format=bibtex", refresh=refresh)
+    if bibtex is not None:
+        _BIBTEX_MEMO[texkey] = bibtex
+    return bibtex
+
+
+def _cache_path(query: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha1(query.encode()).hexdigest())
+
+
+def _cache_expire_after(query: str):
+    # the bibtex entry of a given texkey practically never changes
+    if 'format=bibtex' in query:
+        return None
+    return CACHE_EXPIRE_AFTER
+
+
+def read_cache(query: str) -> bytes:
+    """read_cache get the cached response of a query
 
     Parameters
     ----------
@@ -319,36 +665,381 @@ def make_request(query: str) -> str:
 
     Returns
     -------
-    str
-        response of the request in utf-8 format string
+    bytes
+        the cached response, or None if nothing was cached or if the cached response has expired
     """
+    path = _cache_path(query)
+    try:
+        expire_after = _cache_expire_after(query)
+        if expire_after is not None and time.time() - os.path.getmtime(path) > expire_after:
+            return None
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+    # responses cached by older versions are not compressed
+    if content[:2] == b'\x1f\x8b':
+        try:
+            return gzip.decompress(content)
+        except (OSError, EOFError):
+            return None
+    return content
+
 
-    # Attempting to request data
-    for attempt in range(10):
-        # Try
+def write_cache(query: str, content: bytes) -> None:
+    """write_cache save the response of a query to the disk cache
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by requests.get().
+    content : bytes
+        raw response of the request (stored gzip-compressed)
+    """
+    path = _cache_path(query)
+    # write to a temporary file first, so concurrent requests never read a partial response
+    tmp_path = f'{path}.{os.getpid()}.{time.monotonic_ns()}.tmp'
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=CACHE_COMPRESS_LEVEL))
+        os.replace(tmp_path, path)
+    except OSError as err:
+        warnings.warn(f'Could not write to inspyhep cache at {CACHE_DIR}: {err}')
+        # (otherwise failed writes would leave their temporary files in the cache directory)
         try:
-            response = requests.get(query)
-            response.raise_for_status()
-            try:
-                return response.content.decode().replace("$", "")
-            except AttributeError:
-                message = f'Could not decode website response.content = {(response.content)}. Skipping decoding.'
-                warnings.warn(message)
-                return response.content
-
-        # Too many requests
-        except requests.exceptions.HTTPError as err:
-            if response.status_code == 429:
-                warnings.warn("You have exceeded the number of requests in 5s set by Inspire. Waiting 5s to try again.")
-                time.sleep(5 + 0.01)
-            else:
-                warnings.warn(f"Could not access Inspire data (request status_code = {response.status_code}).")
-                warnings.warn(err)
-                warnings.warn("Trying again...")
-                return None
-    else:
-        warnings.warn(f"Could not access Inspire data using query = {response.url} (request status_code = {response.status_code})")
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+class RecordArrays:
+    """Properties of a collection of Inspire records stored as numpy arrays (one entry per record).
+
+        Filters and sums over many records are then vectorized, instead of looping over InspireRecord instances.
+    """
+
+    def __init__(self, inspire_records: dict):
+        """ RecordArrays()
+
+            Parameters
+            ----------
+            inspire_records : dict
+                dictionary of InspireRecord instances (e.g., Author.inspire_records)
+        """
+        self.records = list(inspire_records.values())
+        n = len(self.records)
+        self.texkey = np.array([record.texkey for record in self.records], dtype=object)
+        self.title = np.array([record.title for record in self.records], dtype=object)
+        self.citation_count = np.fromiter((record.citation_count for record in self.records), dtype=np.int64, count=n)
+        self.citation_count_noself = np.fromiter((record.citation_count_no_self for record in self.records), dtype=np.int64, count=n)
+        self.author_count = np.fromiter((record.author_count for record in self.records), dtype=np.int64, count=n)
+        self.date = np.array([record.date for record in self.records], dtype='datetime64[D]')
+        self.year = self.date.astype('datetime64[Y]').astype(np.int64) + 1970
+        self.citeable = np.fromiter((bool(record.citeable) for record in self.records), dtype=bool, count=n)
+        self.published = np.fromiter((record.published for record in self.records), dtype=bool, count=n)
+        # masks and lists of valid records already computed, with the filter conditions as keys
+        self._masks = {}
+        self._valid_records = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int):
+        return self.records[index]
+
+    def select(self, mask: np.ndarray) -> list:
+        """select get the list of InspireRecord instances selected by a boolean mask"""
+        return [self.records[i] for i in np.flatnonzero(mask)]
+
+    def mask(self, **kwargs) -> np.ndarray:
+        """mask vectorized version of Author.valid_record for all records
+
+        Takes the same conditions as Author.valid_record.
+
+        Returns
+        -------
+        np.ndarray
+            boolean array (read-only), True for records that are valid given conditions
+        """
+        return self._mask_from_key(self._conditions_key(**kwargs))
+
+    def valid_records(self, **kwargs) -> list:
+        """valid_records list of the records that are valid given conditions, built once per set of conditions
+
+        Takes the same conditions as Author.valid_record. The list is shared between callers, so it should not be modified in place.
+
+        Returns
+        -------
+        list
+            InspireRecord instances that are valid given conditions (in the same order as self.records)
+        """
+        key = self._conditions_key(**kwargs)
+        records = self._valid_records.get(key)
+        if records is None:
+            records = self.select(self._mask_from_key(key))
+            self._valid_records[key] = records
+        return records
+
+    @staticmethod
+    def _conditions_key(
+        only_citeable: bool = False,
+        only_published: bool = False,
+        before_date: datetime.date = None,
+        after_date: datetime.date = None,
+        in_year: int = None,
+        max_nauthors: int = 10,
+        from_keys: list = None,
+        exclude_keys: list = None,
+    ) -> tuple:
+        # by default, records up to today (evaluated at call time, so the key changes when the day does)
+        return (
+            only_citeable,
+            only_published,
+            datetime.date.today() if before_date is None else before_date,
+            after_date,
+            in_year,
+            max_nauthors,
+            None if from_keys is None else frozenset(from_keys),
+            None if exclude_keys is None else frozenset(exclude_keys),
+        )
+
+    def _mask_from_key(self, key: tuple) -> np.ndarray:
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._build_mask(*key)
+            mask.flags.writeable = False
+            self._masks[key] = mask
+        return mask
+
+    def _build_mask(self, only_citeable, only_published, before_date, after_date, in_year, max_nauthors, from_keys, exclude_keys) -> np.ndarray:
+        # only the conditions that are actually set are evaluated
+        mask = self.date <= np.datetime64(before_date, 'D')
+        if after_date is not None:
+            mask &= self.date >= np.datetime64(after_date, 'D')
+        if only_citeable:
+            mask &= self.citeable
+        if only_published:
+            mask &= self.published
+        if max_nauthors is not None:
+            mask &= self.author_count <= max_nauthors
+        if in_year is not None:
+            mask &= self.year == in_year
+        if from_keys is not None:
+            mask &= np.isin(self.texkey, list(from_keys))
+        if exclude_keys is not None:
+            mask &= ~np.isin(self.texkey, list(exclude_keys))
+        return mask
+
+
+def make_request(query: str, decode: bool = True, refresh: bool = False) -> str:
+    """make_request make request to website
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by the requests session.
+    decode : bool, optional
+        if True, decode the response to a utf-8 string, otherwise return the raw bytes
+        (which is all json_load_hits needs). By default True
+    refresh : bool, optional
+        if True, ignore the disk cache and request the data from Inspire again. By default False
+        (the disk cache is bypassed altogether when the INSPYHEP_NO_CACHE environment variable is set)
+
+    Returns
+    -------
+    str
+        response of the request in utf-8 format string (or bytes if decode is False), or None if the request failed
+    """
+
+    content = None if (refresh or NO_CACHE) else read_cache(query)
+    if content is not None:
+        return content.decode() if decode else content
+
+    # Attempting to request data (retries are done by the session, see _RETRY)
+    try:
+        _RATE_LIMITER.acquire()
+        response = _SESSION.get(query, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        content = response.content
+        # (decoded before caching, so that responses that cannot be decoded are not cached)
+        result = content.decode() if decode else content
+        if not NO_CACHE:
+            write_cache(query, content)
+        return result
+
+    except requests.exceptions.RequestException as err:
+        # (also connection errors, timeouts and exhausted retries, which have no response to read the status from)
+        status = f" (request status_code = {err.response.status_code})" if err.response is not None else ""
+        warnings.warn(f"Could not access Inspire data using query = {query}{status}: {err}")
         return None
+    except UnicodeDecodeError as err:
+        warnings.warn(f"Could not decode the response of query = {query}: {err}")
+        return None
+
+
+def paged_queries(query: str, max_hits: int, page_size: int = MAX_PAGE_SIZE) -> list:
+    """paged_queries split a query for max_hits results into queries for consecutive pages of results
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by requests.get() (without size or page parameters)
+    max_hits : int
+        the maximum number of hits in query
+    page_size : int, optional
+        number of hits per page, by default MAX_PAGE_SIZE
+
+    Returns
+    -------
+    list
+        list of urls, one for each page
+    """
+    page_size = max(1, min(page_size, max_hits))
+    n_pages = max(1, math.ceil(max_hits / page_size))
+    return [f'{query}&size={page_size}&page={page}' for page in range(1, n_pages + 1)]
+
+
+def get_paged_hits(query: str, max_hits: int, page_size: int = MAX_PAGE_SIZE, max_workers: int = 16, refresh: bool = False) -> list:
+    """get_paged_hits get up to max_hits hits of a query, requesting the pages of results concurrently
+
+        The first page is requested on its own: if it is not full, there are no more hits to request.
+        Otherwise, all remaining pages are requested concurrently.
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by requests.get() (without size or page parameters)
+    max_hits : int
+        the maximum number of hits in query
+    page_size : int, optional
+        number of hits per page, by default MAX_PAGE_SIZE
+    max_workers : int, optional
+        maximum number of requests in flight at any given time, by default 16
+    refresh : bool, optional
+        if True, ignore the cached responses and request the data from Inspire again. By default False
+
+    Returns
+    -------
+    list
+        the list of hits found, in the order of the pages.
+    """
+    queries = paged_queries(query, max_hits, page_size=page_size)
+    # copy, since get_hits returns the hits shared with its memo
+    hits = list(get_hits(queries[0], refresh=refresh) or [])
+    if len(queries) > 1 and len(hits) >= max(1, min(page_size, max_hits)):
+        # each page is parsed as soon as it arrives, overlapping with the download of the other pages
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for page_hits in executor.map(lambda page_query: get_hits(page_query, refresh=refresh), queries[1:]):
+                if page_hits:
+                    hits.extend(page_hits)
+    return hits[:max_hits]
+
+
+def get_hits(query: str, refresh: bool = False) -> list:
+    """get_hits get the hits of a query, parsed only once for repeated queries within the session
+
+        The parsed hits are shared between callers, so they should not be modified in place.
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by make_request().
+    refresh : bool, optional
+        if True, ignore the cached responses and request the data from Inspire again. By default False
+
+    Returns
+    -------
+    list
+        the list of hits found (or the loaded json if the response has no hits).
+    """
+    expire_after = _cache_expire_after(query)
+    if not refresh:
+        with _HITS_MEMO_LOCK:
+            memo = _HITS_MEMO.get(query)
+            if memo is not None and (expire_after is None or time.time() - memo[0] <= expire_after):
+                return memo[1]
+
+    # (the request is made without holding the lock, so other threads can use the memo meanwhile)
+    hits = json_load_hits(make_request(query, decode=False, refresh=refresh))
+    if hits is not None:
+        with _HITS_MEMO_LOCK:
+            _HITS_MEMO.pop(query, None)
+            # forget the oldest queries when the memo is full
+            while len(_HITS_MEMO) >= MEMO_MAX_SIZE:
+                _HITS_MEMO.popitem(last=False)
+            _HITS_MEMO[query] = (time.time(), hits)
+    return hits
+
+
+def get_number_of_hits(query: str, refresh: bool = False) -> int:
+    """get_number_of_hits get the total number of hits of a query without downloading them
+
+    Parameters
+    ----------
+    query : str
+        url with query to be used by requests.get() (without size or fields parameters)
+    refresh : bool, optional
+        if True, ignore the disk cache and request the data from Inspire again. By default False
+
+    Returns
+    -------
+    int
+        total number of hits found by Inspire
+    """
+    # a single hit with a single field is enough to read the total
+    content = make_request(f'{query}&size=1&fields=control_number', decode=False, refresh=refresh)
+    # (a failed request returns None; orjson and json raise a ValueError on malformed content)
+    if content is not None:
+        try:
+            return json_loads(content)['hits']['total']
+        except (AttributeError, TypeError, ValueError, KeyError):
+            pass
+    warnings.warn(f"Not able to read the number of hits of the Inspire request {query}.")
+    return 0
+
+
+def get_records_dict(json_records: list) -> dict:
+    """get_records_dict get a dictionary of inspire records from the hits of an Inspire literature query
+
+    Parameters
+    ----------
+    json_records : list
+        list of hits in the json output of inspire query
+
+    Returns
+    -------
+    dict
+        A dictionary containing instances of the InspireRecord class keys corresponding to the inspire texkeys
+        (e.g., dic['weinberd:2002abc'])
+    """
+    # records without a texkey are skipped upfront
+    records = [pooled_record(record["metadata"]) for record in json_records if InspireRecord.can_parse(record["metadata"])]
+    if len(records) < len(json_records):
+        warnings.warn(f"Skipping {len(json_records) - len(records)} record(s) without a texkey.")
+    return {record.texkey: record for record in records}
+
+
+def pooled_record(json_record: dict) -> InspireRecord:
+    """pooled_record get the InspireRecord of a json record, reusing the instance already built for the same record if there is one
+
+    Parameters
+    ----------
+    json_record : dict
+        metadata of the record in the json output of an inspire query
+
+    Returns
+    -------
+    InspireRecord
+        the record, shared with other authors (or institutions) with the same record in the session
+    """
+    texkey = json_record['texkeys'][0]
+    record = _RECORD_POOL.get(texkey)
+    # the record is built again if Inspire's data changed (e.g., new citations) or if other fields were requested
+    if record is None or record.json_record != json_record:
+        record = InspireRecord(json_record)
+        _RECORD_POOL[texkey] = record
+    return record
 
 
 def json_load_hits(content: str) -> list:
@@ -359,17 +1050,21 @@ def json_load_hits(content: str) -> list:
 
     Parameters
     ----------
-    content : str
-        content in utf-8 formatted string from requests.get
+    content : str or bytes
+        content from requests.get, either as a utf-8 formatted string or as raw bytes
 
     Returns
     -------
     list
         the list of hits found.
     """
+    # (a failed request returns None; orjson and json raise a ValueError on malformed content)
+    if content is None:
+        warnings.warn("Not able to load the content of the Inspire request with json. Content = None")
+        return None
     try:
-        loaded = json.loads(content)
-    except AttributeError:
+        loaded = json_loads(content)
+    except (AttributeError, TypeError, ValueError):
         warnings.warn(f"Not able to load the content of the Inspire request with json. Content = {content}")
         return None
     
@@ -1,5 +1,5 @@
 import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict
 
 
@@ -8,41 +8,41 @@ class author:
     #
     # simplified
     full_name_unicode_normalized: str = ""
-    affiliations_identifiers: List = field(default_factory=lambda: [])
-    inspire_roles: List = field(default_factory=lambda: [])
+    affiliations_identifiers: List = field(default_factory=list)
+    inspire_roles: List = field(default_factory=list)
     last_name: str = ""
     signature_block: str = ""
     uuid: str = ""
     id: str = ""
-    ids: List = field(default_factory=lambda: [])
-    record: Dict = field(default_factory=lambda: {})
+    ids: List = field(default_factory=list)
+    record: Dict = field(default_factory=dict)
     recid: int = ""
     curated_relation: bool = False
     bai: str = ""
-    raw_affiliations: List = field(default_factory=lambda: [])
+    raw_affiliations: List = field(default_factory=list)
     source: str = ""
     first_name: str = ""
-    affiliations: List = field(default_factory=lambda: [])
-    record: Dict = field(default_factory=lambda: {})
+    affiliations: List = field(default_factory=list)
+    record: Dict = field(default_factory=dict)
     full_name: str = ""
     #
     # complete
-    advisors: List = field(default_factory=lambda: [])
-    positions: List = field(default_factory=lambda: [])
-    project_membership: List = field(default_factory=lambda: [])
+    advisors: List = field(default_factory=list)
+    positions: List = field(default_factory=list)
+    project_membership: List = field(default_factory=list)
     schema: str = ""
-    arxiv_categories: List = field(default_factory=lambda: [])
+    arxiv_categories: List = field(default_factory=list)
     control_number: int = 0
     deleted: bool = False
     legacy_creation_date: str = ""
     legacy_version: str = ""
-    name: Dict = field(default_factory=lambda: {})
+    name: Dict = field(default_factory=dict)
     status: str = ""
     stub: bool = False
-    urls: List = field(default_factory=lambda: [])
-    awards: List = field(default_factory=lambda: [])
-    email_addresses: List = field(default_factory=lambda: [])
-    alternative_names: List = field(default_factory=lambda: [])
+    urls: List = field(default_factory=list)
+    awards: List = field(default_factory=list)
+    email_addresses: List = field(default_factory=list)
+    alternative_names: List = field(default_factory=list)
 
     def __post_init__(self):
         self.last_update = datetime.date(1, 1, 1)
@@ -55,23 +55,39 @@ class author:
         else:
             self.affiliation = "Unknown"
 
-        # Get ids
-        for id in self.ids:
-            if id["schema"] == "INSPIRE BAI" and self.bai == "":
-                self.bai = id["value"]
-            elif id["schema"] == "INSPIRE ID":
-                self.id = id["value"].replace("INSPIRE-", "")
+        # Get ids (the first one of each schema)
+        ids = {id.get("schema"): id.get("value", "") for id in reversed(self.ids)}
+        if self.bai == "":
+            self.bai = ids.get("INSPIRE BAI", "")
+        if "INSPIRE ID" in ids:
+            self.id = ids["INSPIRE ID"].replace("INSPIRE-", "")
         if self.id == "":
             self.id = self.recid
 
         self.primary_email_address = self.email_addresses[0] if len(self.email_addresses) > 0 else ""
 
+    @classmethod
+    def from_json(cls, json: dict):
+        """author from the json of an Inspire author, ignoring the keys that are not fields of author
+
+        (keys that Inspire prefixes with $, e.g., '$schema', fill the field without it)
+        """
+        kwargs = {}
+        for key, value in json.items():
+            key = key.lstrip("$")
+            if key in _AUTHOR_FIELDS:
+                kwargs[key] = value
+        return cls(**kwargs)
+
+
+_AUTHOR_FIELDS = frozenset(f.name for f in fields(author))
+
 
 @dataclass
 class literature:
     full_name_unicode_normalized: str = ""
-    affiliations_identifiers: List = field(default_factory=lambda: [])
-    record: Dict = field(default_factory=lambda: {})
+    affiliations_identifiers: List = field(default_factory=list)
+    record: Dict = field(default_factory=dict)
 
     def __post_init__(self):
         self.last_update = datetime.date(1, 1, 1)
@@ -80,20 +96,20 @@ class literature:
 @dataclass
 class institution:
     number_of_papers: int = 0
-    addresses: List = field(default_factory=lambda: [])
-    ICN: List = field(default_factory=lambda: [])
+    addresses: List = field(default_factory=list)
+    ICN: List = field(default_factory=list)
     core: bool = True
-    self: Dict = field(default_factory=lambda: {})
-    urls: List = field(default_factory=lambda: [])
+    self: Dict = field(default_factory=dict)
+    urls: List = field(default_factory=list)
     schema: str = ""
     legacy_ICN: str = ""
-    name_variants: List = field(default_factory=lambda: [])
+    name_variants: List = field(default_factory=list)
     control_number: int = 0
     legacy_version: str = ""
-    institution_type: List = field(default_factory=lambda: [])
+    institution_type: List = field(default_factory=list)
     legacy_creation_date: str = ""
-    institution_hierarchy: List = field(default_factory=lambda: [])
-    external_system_identifiers: List = field(default_factory=lambda: [])
+    institution_hierarchy: List = field(default_factory=list)
+    external_system_identifiers: List = field(default_factory=list)
 
     def __post_init__(self):
         self.last_update = datetime.date(1, 1, 1)
@@ -0,0 +1,93 @@
+"""Offline fixtures: Inspire is replaced by a fake session that answers from examples/example_inspire_record.json."""
+import json
+import os
+from collections import OrderedDict
+from urllib.parse import unquote
+
+import pytest
+
+import inspyhep.literature_tools as lt
+
+EXAMPLE_RECORDS = os.path.join(os.path.dirname(__file__), "..", "examples", "example_inspire_record.json")
+
+AUTHOR_METADATA = {
+    "ids": [{"schema": "INSPIRE BAI", "value": "M.Hostert.1"}, {"schema": "INSPIRE ID", "value": "INSPIRE-00012345"}],
+    "name": {"value": "Hostert, Matheus"},
+    "recid": 1621061,
+    "control_number": 1621061,
+    "email_addresses": [{"value": "mhostert@pitp.ca"}],
+    "positions": [],
+}
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, url: str, status_code: int = 200):
+        self.content = content
+        self.url = url
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise lt.requests.exceptions.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+
+class FakeInspire:
+    """Answers Inspire API queries with the example records (paged with size= and page=, filtered by texkeys:, trimmed to fields=)."""
+
+    def __init__(self, hits: list):
+        self.hits = hits
+        self.calls = []
+        self.status_code = 200
+
+    def get(self, url, timeout=None):
+        self.calls.append(url)
+        if self.status_code != 200:
+            return FakeResponse(b"", url, status_code=self.status_code)
+        query = unquote(url)
+        if "format=bibtex" in query:
+            texkey = query.split("texkeys:")[1].split("&")[0]
+            return FakeResponse(f"@article{{{texkey}, title={{$x^2$}}}}".encode(), url)
+        if "api/authors" in query:
+            return FakeResponse(json.dumps({"hits": {"hits": [{"metadata": AUTHOR_METADATA}], "total": 1}}).encode(), url)
+
+        hits = self.hits
+        if "texkeys:" in query:
+            hits = [hit for hit in hits if any(f"texkeys:{key}" in query for key in hit["metadata"]["texkeys"])]
+        params = dict(part.split("=", 1) for part in query.split("?", 1)[1].split("&") if "=" in part)
+        total = len(hits)
+        if "size" in params:
+            size, page = int(params["size"]), int(params.get("page", 1))
+            hits = hits[(page - 1) * size : page * size]
+        if "fields" in params:
+            fields = params["fields"].split(",")
+            hits = [dict(hit, metadata={key: value for key, value in hit["metadata"].items() if key in fields}) for hit in hits]
+        return FakeResponse(json.dumps({"hits": {"hits": hits, "total": total}}).encode(), url)
+
+    def literature_calls(self):
+        return [call for call in self.calls if "api/literature" in call]
+
+
+@pytest.fixture(scope="session")
+def example_hits():
+    """hits of examples/example_inspire_record.json (loaded once, tests must not modify them)"""
+    with open(EXAMPLE_RECORDS) as f:
+        return json.load(f)["hits"]["hits"]
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    """each test gets an empty disk cache, empty memos, an empty record pool, and no rate limit"""
+    monkeypatch.setattr(lt, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(lt, "NO_CACHE", False)
+    monkeypatch.setattr(lt, "_HITS_MEMO", OrderedDict())
+    monkeypatch.setattr(lt, "_BIBTEX_MEMO", {})
+    monkeypatch.setattr(lt, "_RECORD_POOL", lt.WeakValueDictionary())
+    monkeypatch.setattr(lt, "_RATE_LIMITER", lt._RateLimiter(per_second=1e9, burst=10**9))
+
+
+@pytest.fixture
+def inspire(monkeypatch, example_hits):
+    """fake Inspire behind the module's session"""
+    fake = FakeInspire(example_hits)
+    monkeypatch.setattr(lt._SESSION, "get", fake.get)
+    return fake
@@ -0,0 +1,129 @@
+import copy
+import datetime
+
+import numpy as np
+import pytest
+
+from inspyhep.author_tools import Author, build_authors, identifier_kind, strip_string
+
+
+@pytest.fixture
+def author(inspire):
+    return Author("M.Hostert.1")
+
+
+def test_identifier_kind():
+    assert identifier_kind("0000-0002-9584-8877") == "orcid"
+    assert identifier_kind("0000-0002-9584-887X") == "orcid"
+    assert identifier_kind("1621061") == "recid"
+    assert identifier_kind(1621061) == "recid"
+    assert identifier_kind("M.Hostert.1") == "bai"
+
+
+def test_author_queries(author, inspire):
+    assert author.bai == "M.Hostert.1"
+    assert inspire.calls == ["https://inspirehep.net/api/authors?q=ids.value:M.Hostert.1"]
+    # literature records are only requested when first needed
+    assert len(author.inspire_records) == 49
+    assert len(inspire.literature_calls()) == 1
+    assert "fields=" in inspire.literature_calls()[0]
+    assert author[0] is next(iter(author))
+    assert author["Batell:2022xau"].texkey == "Batell:2022xau"
+
+
+def test_metadata_is_completed_with_the_latest_record(author, inspire):
+    assert author.profile_metadata.bai == "M.Hostert.1"
+    assert author.profile_metadata.recid == 1621061
+    assert len(inspire.calls) == 1
+    # only the metadata completed with the latest record needs the author's records
+    assert author.metadata.affiliation == "Cambridge U., DAMTP"
+    assert author.metadata.recid == 1621061
+    assert len(inspire.calls) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"max_nauthors": None},
+        {"only_citeable": True},
+        {"only_published": True, "max_nauthors": 5},
+        {"in_year": 2020},
+        {"from_keys": ["Batell:2022xau", "Not:2020abc"]},
+        {"exclude_keys": ["Batell:2022xau"], "max_nauthors": 20},
+        {"before_date": datetime.date(2021, 1, 1), "after_date": datetime.date(2019, 6, 1)},
+    ],
+)
+def test_valid_records_mask_matches_valid_record(author, kwargs):
+    expected = [author.valid_record(record, **kwargs) for record in author.inspire_records.values()]
+    mask = author.valid_records_mask(**kwargs)
+    assert mask.dtype == bool
+    assert mask.tolist() == expected
+    assert [record.texkey for record in author._filtered(**kwargs)] == [key for key, valid in zip(author.inspire_records, expected) if valid]
+
+
+def test_totals_match_valid_record(author):
+    valid = [record for record in author.inspire_records.values() if author.valid_record(record, only_published=True)]
+    assert author.get_total_number_of_citations(only_published=True) == sum(record.citation_count for record in valid)
+    assert author.get_number_of_records(only_published=True) == len(valid)
+    per_year = author.get_publications_per_year(only_published=True)
+    assert sum(per_year) == len(valid)
+    assert np.all(np.diff(author.get_publications_per_year(cumulative=True)) >= 0)
+
+
+def test_num_hits_is_the_total_in_inspire(inspire):
+    author = Author("M.Hostert.1", max_papers=20)
+    assert author.num_hits == 49
+    assert len(author.inspire_records) == 20
+
+
+def test_build_many(inspire):
+    authors = Author.build_many(["M.Hostert.1", "M.Hostert.1"], max_papers=20, max_workers=2)
+    assert [author.bai for author in authors] == ["M.Hostert.1", "M.Hostert.1"]
+    assert [len(author.inspire_records) for author in authors] == [20, 20]
+
+
+def test_build_authors(inspire):
+    authors = build_authors(["M.Hostert.1", "M.Hostert.1"], max_papers=20, max_workers=2)
+    assert list(authors) == ["M.Hostert.1"]
+    assert len(authors["M.Hostert.1"].inspire_records) == 20
+
+
+def test_get_bibtex(author, inspire):
+    bibtex = author.get_bibtex(from_keys=["Batell:2022xau"], max_nauthors=None)
+    assert bibtex == {"Batell:2022xau": "@article{Batell:2022xau, title={$x^2$}}"}
+
+
+def test_get_markdown_descriptor(author, tmp_path, capsys):
+    author.get_markdown_descriptor(path=str(tmp_path), from_keys=["Batell:2022xau"], max_nauthors=None)
+    (md_file,) = tmp_path.glob("*.md")
+    content = md_file.read_text()
+    assert content.startswith("---\ntitle: ")
+    assert "pub_number: 1" in content
+    assert "SUCESSFULLY PARSED" in capsys.readouterr().out
+
+
+def test_format_author_escapes_quotes(author):
+    # (a copy, since the coauthor dataclasses belong to records shared through the record pool)
+    coauthor = copy.copy(next(iter(author.coauthors.values())))
+    coauthor.affiliation = 'The "Best" U.'
+    row = author.format_author(coauthor)
+    assert row.endswith(f'"The ""Best"" U.","{coauthor.last_update.year}"')
+    assert "Best" not in author.get_coauthors_formatted()
+
+
+def test_get_coauthors_formatted_with_conditions(author):
+    assert len(author.get_coauthors_formatted().splitlines()) == len(author.coauthors) + 1
+    coauthors = author.get_coauthors(in_year=2020)
+    assert 0 < len(coauthors) < len(author.coauthors)
+    assert len(author.get_coauthors_formatted(in_year=2020).splitlines()) == len(coauthors) + 1
+
+
+def test_strip_string():
+    assert strip_string("H<sub>2</sub>O &amp; $\\nu^\\prime$ <i>x</i>") == "H2O & $\\nu$ x"
+
+
+def test_strip_string_agrees_with_bs4():
+    pytest.importorskip("bs4")
+    for string in ["H<sub>2</sub>O &amp; $\\nu^\\prime$ <i>x</i>", "<b>Z'</b> &lt; 1 TeV", "plain text"]:
+        assert strip_string(string) == strip_string(string, use_bs4=True)
@@ -0,0 +1,413 @@
+import gzip
+import os
+import subprocess
+import sys
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+
+import inspyhep.literature_tools as lt
+from inspyhep.literature_tools import InspireRecord
+
+
+# paging
+def test_paged_queries():
+    assert lt.paged_queries("u?q=x", 30) == ["u?q=x&size=30&page=1"]
+    assert lt.paged_queries("u?q=x", 250) == ["u?q=x&size=250&page=1"]
+    assert lt.paged_queries("u?q=x", 1000) == [f"u?q=x&size=250&page={page}" for page in range(1, 5)]
+    assert len(lt.paged_queries("u?q=x", 1001)) == 5
+
+
+def test_get_paged_hits_stops_after_a_partial_first_page(inspire, example_hits):
+    hits = lt.get_paged_hits("https://inspirehep.net/api/literature?q=x", 1000)
+    assert len(hits) == len(example_hits)
+    assert len(inspire.literature_calls()) == 1
+
+
+def test_get_paged_hits_requests_all_pages(inspire, example_hits):
+    hits = lt.get_paged_hits("https://inspirehep.net/api/literature?q=x", 1000, page_size=10)
+    assert [hit["metadata"]["control_number"] for hit in hits] == [hit["metadata"]["control_number"] for hit in example_hits]
+    # the first page is full, so all pages up to max_hits are requested
+    assert sorted(int(call.split("page=")[1]) for call in inspire.literature_calls()) == list(range(1, 101))
+
+
+def test_get_paged_hits_caps_at_max_hits(inspire):
+    hits = lt.get_paged_hits("https://inspirehep.net/api/literature?q=x", 25, page_size=10)
+    assert len(hits) == 25
+    assert len(inspire.literature_calls()) == 3
+
+
+def test_get_paged_hits_does_not_modify_the_memo(inspire):
+    query = "https://inspirehep.net/api/literature?q=x"
+    lt.get_paged_hits(query, 1000).clear()
+    assert len(lt.get_paged_hits(query, 1000)) > 0
+
+
+# texkey batching
+def test_bulk_from_texkeys(inspire, example_hits):
+    texkeys = [hit["metadata"]["texkeys"][0] for hit in example_hits[:5]]
+    with pytest.warns(UserWarning, match="Nope:2020abc"):
+        records = InspireRecord.bulk_from_texkeys(texkeys[::-1] + ["Nope:2020abc", texkeys[0]], batch=2)
+    assert list(records) == texkeys[::-1]
+    assert all(records[key].texkey == key for key in texkeys)
+    # 6 unique texkeys in batches of 2
+    assert len(inspire.literature_calls()) == 3
+    assert all("fields=" in call for call in inspire.literature_calls())
+
+
+def test_bulk_from_texkeys_finds_records_by_any_texkey(inspire, example_hits):
+    hit = next(hit for hit in example_hits if len(hit["metadata"]["texkeys"]) > 1)
+    old_texkey = hit["metadata"]["texkeys"][1]
+    records = InspireRecord.bulk_from_texkeys([old_texkey])
+    assert records[old_texkey].texkey == hit["metadata"]["texkeys"][0]
+
+
+def test_bulk_from_texkeys_shares_pooled_records(inspire, example_hits):
+    texkey = example_hits[0]["metadata"]["texkeys"][0]
+    records = InspireRecord.bulk_from_texkeys([texkey])
+    assert InspireRecord.bulk_from_texkeys([texkey])[texkey] is records[texkey]
+    # the same fields as an author's records, so the records are the same instances
+    hits = lt.get_hits(f"https://inspirehep.net/api/literature?fields={lt.LITERATURE_FIELDS}&q=x")
+    assert lt.get_records_dict(hits)[texkey] is records[texkey]
+
+
+# disk cache
+QUERY = "https://inspirehep.net/api/literature?q=x&size=10&page=1"
+
+
+def test_cache_is_used(inspire):
+    first = lt.make_request(QUERY)
+    assert lt.make_request(QUERY) == first
+    assert len(inspire.calls) == 1
+
+
+def test_cache_files_are_gzipped(inspire):
+    content = lt.make_request(QUERY, decode=False)
+    with open(lt._cache_path(QUERY), "rb") as f:
+        assert gzip.decompress(f.read()) == content
+
+
+def test_cache_refresh(inspire):
+    lt.make_request(QUERY)
+    lt.make_request(QUERY, refresh=True)
+    assert len(inspire.calls) == 2
+
+
+def test_uncompressed_cache_files_are_read(inspire):
+    os.makedirs(lt.CACHE_DIR)
+    with open(lt._cache_path(QUERY), "wb") as f:
+        f.write(b'{"hits": {"hits": [], "total": 0}}')
+    assert lt.make_request(QUERY) == '{"hits": {"hits": [], "total": 0}}'
+    assert inspire.calls == []
+
+
+def test_failed_cache_writes_leave_no_temporary_files(inspire, monkeypatch):
+    def replace(src, dst):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(lt.os, "replace", replace)
+    with pytest.warns(UserWarning, match="Could not write to inspyhep cache"):
+        assert lt.make_request(QUERY) is not None
+    assert os.listdir(lt.CACHE_DIR) == []
+
+
+def _age_cache(query, seconds):
+    path = lt._cache_path(query)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_cache_expires(inspire):
+    lt.make_request(QUERY)
+    _age_cache(QUERY, lt.CACHE_EXPIRE_AFTER + 60)
+    lt.make_request(QUERY)
+    assert len(inspire.calls) == 2
+
+
+def test_bibtex_queries_never_expire(inspire):
+    texkey_query = "https://inspirehep.net/api/literature?q=texkeys:Batell:2022xau"
+    bibtex_query = "https://inspirehep.net/api/literature?q=texkeys:Batell:2022xau&format=bibtex"
+    # records requested by texkey include citation counts, so they expire like any other query
+    assert lt._cache_expire_after(texkey_query) == lt.CACHE_EXPIRE_AFTER
+    assert lt._cache_expire_after(bibtex_query) is None
+    for query, age in ((texkey_query, lt.CACHE_EXPIRE_AFTER + 60), (bibtex_query, 10 * 365 * 86400)):
+        lt.make_request(query)
+        _age_cache(query, age)
+        lt.make_request(query)
+    assert len(inspire.calls) == 3
+
+
+def test_no_cache(inspire, monkeypatch):
+    monkeypatch.setattr(lt, "NO_CACHE", True)
+    lt.make_request(QUERY)
+    lt.make_request(QUERY)
+    assert len(inspire.calls) == 2
+    assert not os.path.exists(lt.CACHE_DIR)
+
+
+@pytest.mark.parametrize("value, no_cache", [("1", True), ("yes", True), ("0", False), ("", False)])
+def test_no_cache_environment_variable(value, no_cache):
+    env = dict(os.environ, INSPYHEP_NO_CACHE=value)
+    out = subprocess.run([sys.executable, "-c", "import inspyhep.literature_tools as lt; print(lt.NO_CACHE)"], env=env, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == str(no_cache)
+
+
+# in-memory memos
+def test_get_hits_memo(inspire):
+    assert lt.get_hits(QUERY) is lt.get_hits(QUERY)
+    assert len(inspire.calls) == 1
+    lt.get_hits(QUERY, refresh=True)
+    assert len(inspire.calls) == 2
+
+
+def test_get_hits_memo_is_capped_across_threads(monkeypatch):
+    monkeypatch.setattr(lt, "make_request", lambda query, **kwargs: b'{"hits": {"hits": [1]}}')
+
+    def work(start):
+        for i in range(400):
+            lt.get_hits(f"q{(start + i) % 1000}")
+
+    threads = [threading.Thread(target=work, args=(100 * n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(lt._HITS_MEMO) == lt.MEMO_MAX_SIZE
+
+
+def test_failed_bibtex_requests_are_not_memoized(inspire):
+    inspire.status_code = 404
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert lt.get_bibtex_from_key("Batell:2022xau") is None
+    inspire.status_code = 200
+    assert lt.get_bibtex_from_key("Batell:2022xau") == "@article{Batell:2022xau, title={$x^2$}}"
+    lt.get_bibtex_from_key("Batell:2022xau")
+    assert len(inspire.calls) == 2
+
+
+@pytest.mark.parametrize("parser", [lt.json.loads, pytest.param("orjson", id="orjson")])
+def test_failed_requests_with_either_parser(monkeypatch, parser):
+    if parser == "orjson":
+        parser = pytest.importorskip("orjson").loads
+    monkeypatch.setattr(lt, "json_loads", parser)
+    monkeypatch.setattr(lt, "make_request", lambda query, **kwargs: None)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert lt.get_hits(QUERY) is None
+        assert lt.get_paged_hits(QUERY, 10) == []
+        assert lt.get_number_of_hits(QUERY) == 0
+        assert lt.json_load_hits(b"{not json") is None
+
+
+# rate limit
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(lt, "time", clock)
+    limiter = lt._RateLimiter(per_second=2, burst=3)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.sleeps == []
+    limiter.acquire()
+    assert clock.sleeps == [0.5]
+    limiter.pause(2)
+    limiter.acquire()
+    assert clock.sleeps[-1] == pytest.approx(2.5)
+
+
+# retries
+@pytest.fixture
+def local_server(monkeypatch):
+    """local http server answering with the (status, headers) in `responses` (then 200), behind a session using lt._RETRY"""
+    responses = []
+    requested = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requested.append(self.path)
+            status, headers = responses.pop(0) if responses else (200, {})
+            body = b'{"hits": {"hits": [], "total": 0}}' if status == 200 else b""
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(max_retries=lt._RETRY))
+    monkeypatch.setattr(lt, "_SESSION", session)
+    monkeypatch.setattr(lt, "TOO_MANY_REQUESTS_WAIT", 0)
+    pauses = []
+    monkeypatch.setattr(lt._RATE_LIMITER, "pause", pauses.append)
+    yield f"http://127.0.0.1:{server.server_port}/api/literature?q=x", responses, requested, pauses
+    server.shutdown()
+    server.server_close()
+
+
+def test_too_many_requests_is_retried(local_server):
+    url, responses, requested, pauses = local_server
+    responses.extend([(429, {"Retry-After": "0"}), (429, {})])
+    with pytest.warns(UserWarning, match="exceeded the number of requests"):
+        assert lt.make_request(url) == '{"hits": {"hits": [], "total": 0}}'
+    assert len(requested) == 3
+    # all threads are held back, for as long as Inspire asks or TOO_MANY_REQUESTS_WAIT
+    assert pauses == [0, 0]
+
+
+def test_too_many_requests_gives_up(local_server):
+    url, responses, requested, pauses = local_server
+    responses.extend([(429, {"Retry-After": "0"})] * 10)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert lt.make_request(url) is None
+    assert len(requested) == lt._RETRY.total + 1
+    assert any("status_code = 429" in str(warning.message) for warning in caught)
+
+
+def test_too_many_requests_gives_up_with_retry_error(local_server):
+    url, responses, requested, pauses = local_server
+    # urllib3 raises MaxRetryError (requests' RetryError) on exhausted retries when it raises on status
+    lt._SESSION.mount("http://", HTTPAdapter(max_retries=lt._RETRY.new(raise_on_status=True)))
+    responses.extend([(429, {"Retry-After": "0"})] * 10)
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        assert lt.make_request(url) is None
+    assert len(requested) == lt._RETRY.total + 1
+    assert any("too many 429 error responses" in str(warning.message) for warning in caught)
+
+
+def test_server_errors_are_retried_without_pausing(local_server):
+    url, responses, requested, pauses = local_server
+    responses.append((503, {}))
+    assert lt.make_request(url) is not None
+    assert len(requested) == 2
+    assert pauses == []
+
+
+@pytest.mark.parametrize("error", [requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.RetryError])
+def test_requests_without_a_response_warn(monkeypatch, error):
+    def get(url, timeout=None):
+        raise error("no response")
+
+    monkeypatch.setattr(lt._SESSION, "get", get)
+    with pytest.warns(UserWarning, match="Could not access Inspire data using query = .*: no response"):
+        assert lt.make_request(QUERY) is None
+
+
+def test_undecodable_responses_warn(monkeypatch):
+    response = SimpleNamespace(content=b"\xff\xfe", raise_for_status=lambda: None)
+    monkeypatch.setattr(lt._SESSION, "get", lambda url, timeout=None: response)
+    with pytest.warns(UserWarning, match="Could not decode the response of query"):
+        assert lt.make_request(QUERY) is None
+    assert not os.path.exists(lt._cache_path(QUERY))
+
+
+def test_failed_pages_do_not_stop_the_other_pages(inspire, monkeypatch):
+    def get(url, timeout=None):
+        if url.endswith("page=3"):
+            raise requests.exceptions.ConnectionError("no response")
+        return inspire.get(url, timeout=timeout)
+
+    monkeypatch.setattr(lt._SESSION, "get", get)
+    with pytest.warns(UserWarning, match="page=3"):
+        hits = lt.get_paged_hits("https://inspirehep.net/api/literature?q=x", 1000, page_size=10)
+    assert len(hits) == len(inspire.hits) - 10
+
+
+# records
+def test_record_from_json(example_hits):
+    record = InspireRecord(example_hits[0]["metadata"])
+    assert record.texkey == "Batell:2022xau"
+    assert record.ins_schema == record.json_record["$schema"]
+    assert record.authors_last_name[:2] == ["Batell", "Berger"]
+    assert record.capped_at_3_authorlist == "Batell, Berger, Brdar"
+    assert record.capped_at_1_authorlist == "Batell et al"
+    with pytest.raises(AttributeError):
+        record.ins_not_a_key
+
+
+def test_record_strips_dollars_from_text(example_hits):
+    json_record = dict(example_hits[0]["metadata"])
+    authors = [dict(author) for author in json_record["authors"]]
+    authors[0].update(full_name="Batell, $B$rian", first_name="$B$rian")
+    json_record.update(authors=authors, first_author=dict(json_record["first_author"], full_name="Batell, $B$rian"))
+    record = InspireRecord(json_record)
+    assert record.first_author == "Batell, Brian"
+    assert record.authors_first_name[0] == "Brian"
+    assert record.authorlist.startswith("Brian Batell")
+    assert record.ins_authors[0]["full_name"] == "Batell, Brian"
+    assert record.ins_authors is record.ins_authors
+    assert record.authors["B.Batell.1"].full_name == "Batell, Brian"
+    assert "$" not in repr(record)
+
+
+def test_record_proceedings(example_hits):
+    document_types = {}
+    for hit in example_hits:
+        record = InspireRecord(hit["metadata"])
+        document_types[tuple(hit["metadata"]["document_type"])] = record.proceedings
+    assert document_types[("proceedings",)]
+    assert document_types[("conference paper",)]
+    assert not document_types[("article",)]
+
+
+def test_record_date_fallbacks(example_hits):
+    json_record = dict(example_hits[0]["metadata"], earliest_date="2021-05", preprint_date="2020-01-01")
+    assert InspireRecord(json_record).date == lt.datetime.date(2021, 5, 1)
+    for key in ("earliest_date", "preprint_date", "publication_info"):
+        json_record.pop(key, None)
+    assert InspireRecord(json_record).date == lt.datetime.date(2022, 1, 1)
+    json_record["texkeys"] = ["Batell:abc"]
+    with pytest.warns(UserWarning, match="No date found"):
+        assert InspireRecord(json_record).date == lt.datetime.date(1, 1, 1)
+
+
+def test_record_from_texkey(inspire):
+    record = InspireRecord("Batell:2022xau", fields=lt.LITERATURE_FIELDS)
+    assert record.texkey == "Batell:2022xau"
+    assert "fields=" in inspire.calls[0]
+    with pytest.raises(ValueError, match="No record found"):
+        InspireRecord("Nope:2020abc")
+
+
+def test_record_from_texkey_failed_request(inspire):
+    inspire.status_code = 503
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        with pytest.raises(ValueError, match="No record found with requests.get.*texkeys:Batell:2022xau"):
+            InspireRecord("Batell:2022xau")
+
+
+def test_record_pool(example_hits):
+    records = lt.get_records_dict(example_hits)
+    again = lt.get_records_dict(example_hits)
+    assert all(again[key] is record for key, record in records.items())
+    changed = dict(example_hits[0]["metadata"], citation_count=10**6)
+    assert lt.pooled_record(changed) is not records[changed["texkeys"][0]]
+    with pytest.warns(UserWarning, match="Skipping 1 record"):
+        assert len(lt.get_records_dict(example_hits + [{"metadata": {"titles": []}}])) == len(records)